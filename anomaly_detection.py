@@ -0,0 +1,105 @@
+# anomaly_detection.py
+import numpy as np
+import pandas as pd
+from data_store import data_store
+
+BASELINE_DAYS = 28
+MIN_BASELINE = 1.0  # Pages averaging less than this per day are too noisy to score
+MAX_RANGE_DAYS = 92  # Longest range scan_pages scores in one call
+BLOCK_CELLS = 1_000_000  # Page x day cells scored at once; bounds the scan's working memory
+
+def build_page_day_matrix(df, metric, start_date, end_date):
+    """Lay a metric out as a dense page x day matrix.
+
+    df holds page_id, date and metric columns (one or more rows per page and
+    day). Only pages present in df get a matrix row; missing days are 0.
+    """
+    start = pd.Timestamp(start_date).normalize()
+    days = pd.date_range(start, pd.Timestamp(end_date).normalize(), freq='D')
+
+    page_ids, page_idx = np.unique(df['page_id'].to_numpy(), return_inverse=True)
+    day_idx = (df['date'].to_numpy() - np.datetime64(start)) // np.timedelta64(1, 'D')
+
+    matrix = np.bincount(
+        page_idx * len(days) + day_idx.astype(np.int64),
+        weights=df[metric].to_numpy(dtype=float),
+        minlength=len(page_ids) * len(days)
+    ).reshape(len(page_ids), len(days))
+    return page_ids, days, matrix
+
+def scan_pages(start_date, end_date, metric='clicks', section=None, baseline_days=BASELINE_DAYS):
+    """Score every page's movement over a date range against its trailing baseline.
+
+    For each day in the range the baseline is the mean and standard deviation of
+    the preceding baseline_days; the page score is the mean daily z-score over
+    the range, alongside the least-squares slope and the change of the range's
+    daily mean against the baseline just before it. Pages are scored in blocks
+    of at most BLOCK_CELLS page x day cells, so working memory stays bounded
+    however many pages there are. Ranges longer than MAX_RANGE_DAYS raise
+    ValueError.
+    """
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise ValueError(f"Scan range is limited to {MAX_RANGE_DAYS} days")
+    window_start = start - pd.Timedelta(days=baseline_days)
+
+    df = data_store.backend.aggregate(
+        window_start, end, by=['page_id', 'date'], section=section, **{metric: (metric, 'sum')}
+    ).sort_values('page_id', kind='stable')
+
+    # Pages are sorted, so each block of pages is one contiguous run of rows
+    row_pages = df['page_id'].to_numpy()
+    page_ids = np.unique(row_pages)
+    days = (end - window_start).days + 1
+    block_size = max(1, BLOCK_CELLS // days)
+    blocks = []
+    for first in range(0, len(page_ids), block_size):
+        block_pages = page_ids[first:first + block_size]
+        lo = np.searchsorted(row_pages, block_pages[0], side='left')
+        hi = np.searchsorted(row_pages, block_pages[-1], side='right')
+        _, _, matrix = build_page_day_matrix(df.iloc[lo:hi], metric, window_start, end)
+        blocks.append(score_block(block_pages, matrix, baseline_days))
+
+    if not blocks:
+        blocks.append(score_block(page_ids, np.zeros((0, days)), baseline_days))
+    results = pd.concat(blocks, ignore_index=True)
+    results = results[(results['baseline'] >= MIN_BASELINE) | (results['recent'] >= MIN_BASELINE)]
+    results['page'] = data_store.pages[results['page_id']]
+    results['type'] = data_store.page_types.reindex(results['page_id']).values
+    return results.reset_index(drop=True)
+
+def score_block(page_ids, matrix, baseline_days=BASELINE_DAYS):
+    """Score the pages of one page x day matrix whose first baseline_days columns are the baseline"""
+    # Trailing window sums via cumulative sums along the day axis
+    zeros = np.zeros((len(page_ids), 1))
+    csum = np.hstack([zeros, np.cumsum(matrix, axis=1)])
+    csum_sq = np.hstack([zeros, np.cumsum(np.square(matrix), axis=1)])
+    ends = np.arange(baseline_days, matrix.shape[1])
+    base_mean = (csum[:, ends] - csum[:, ends - baseline_days]) / baseline_days
+    base_var = (csum_sq[:, ends] - csum_sq[:, ends - baseline_days]) / baseline_days - base_mean ** 2
+    del csum, csum_sq
+    # Floor the spread at a Poisson-like sqrt(mean) so flat baselines don't explode
+    base_std = np.sqrt(np.maximum(base_var, np.maximum(base_mean, MIN_BASELINE)))
+
+    recent = matrix[:, baseline_days:]
+    z_score = ((recent - base_mean) / base_std).mean(axis=1)
+
+    t = np.arange(recent.shape[1], dtype=float)
+    t -= t.mean()
+    denom = (t ** 2).sum()
+    slope = recent @ t / denom if denom else np.zeros(len(page_ids))
+
+    baseline = base_mean[:, 0]
+    recent_mean = recent.mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = np.where(baseline > 0, (recent_mean - baseline) / baseline * 100, np.nan)
+
+    return pd.DataFrame({
+        'page_id': page_ids,
+        'baseline': baseline,
+        'recent': recent_mean,
+        'change_pct': change_pct,
+        'z_score': z_score,
+        'slope': slope
+    })
@@ -1,16 +1,34 @@
 # app.py
+import startup_profile
+startup_profile.install()
+
+import logging
+import os
 import dash
 from dash import Dash, html, dcc
 import dash_bootstrap_components as dbc
 from data_store import data_store
 
-# Load data
-data_store.load_data('final_plotly_data.csv')  # Replace with your data file path
+# Show the app's own INFO logs, such as figure-encoding savings (DASHBOARD_LOG_LEVEL)
+logging.basicConfig(
+    level=os.environ.get('DASHBOARD_LOG_LEVEL', 'INFO').upper(),
+    format='[%(asctime)s] [%(process)d] [%(levelname)s] %(name)s: %(message)s'
+)
+
+# Load data (DASHBOARD_BACKEND selects 'pandas' or the on-disk 'sqlite' backend)
+with startup_profile.phase('load data'):
+    data_store.load_data(
+        os.environ.get('DASHBOARD_DATA', 'final_plotly_data.csv'),
+        backend=os.environ.get('DASHBOARD_BACKEND', 'pandas'),
+        db_path=os.environ.get('DASHBOARD_DB_PATH')
+    )
 
 # Initialize the app
-app = Dash(__name__, 
-          use_pages=True, 
-          external_stylesheets=[dbc.themes.FLATLY])
+with startup_profile.phase('register pages'):
+    app = Dash(__name__, 
+              use_pages=True, 
+              external_stylesheets=[dbc.themes.FLATLY])
+server = app.server
 
 # Create navbar
 # app.py (update navbar section)
@@ -19,7 +37,9 @@ navbar = dbc.NavbarSimple(
         dbc.NavItem(dbc.NavLink("Overview", href="/")),
         dbc.NavItem(dbc.NavLink("Detailed Metrics", href="/detailed-metrics")), 
         dbc.NavItem(dbc.NavLink("Time Analysis", href="/time-analysis")),
-        dbc.NavItem(dbc.NavLink("Comparison", href="/comparison"))
+        dbc.NavItem(dbc.NavLink("Comparison", href="/comparison")),
+        dbc.NavItem(dbc.NavLink("Page Metrics", href="/page-metrics")),
+        dbc.NavItem(dbc.NavLink("Page Alerts", href="/page-alerts"))
     ],
     brand="Search Console Analytics",
     brand_href="/",
@@ -27,11 +47,30 @@ navbar = dbc.NavbarSimple(
     dark=True,
 )
 
+# Site section filter shared by every page
+section_filter = dbc.Container([
+    dbc.Row([
+        dbc.Col([
+            html.Label("Site Section:"),
+            dcc.Dropdown(
+                id='section-filter',
+                options=[{'label': section, 'value': section} for section in data_store.sections],
+                value=None,
+                placeholder="All sections",
+                className="mb-3"
+            )
+        ], width=4)
+    ], className="mt-3")
+])
+
 # Define app layout
 app.layout = html.Div([
     navbar,
+    section_filter,
     dash.page_container
 ])
 
+startup_profile.report(server)
+
 if __name__ == '__main__':
     app.run_server(debug=True)
\ No newline at end of file
@@ -0,0 +1,68 @@
+# benchmarks/backends.py
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from data_store import DataStore, BACKENDS
+from benchmarks.synthetic_data import generate
+
+def benchmark_queries(store):
+    """Representative dashboard queries, keyed by name"""
+    backend = store.backend
+    end = store.max_date
+    month = end - pd.Timedelta(days=29)
+    quarter = end - pd.Timedelta(days=89)
+    section = store.sections[0] if store.sections else None
+    return {
+        'totals (all dates)': lambda: backend.aggregate(
+            clicks=('clicks', 'sum'), impressions=('impressions', 'sum'), pages=('page_id', 'nunique')),
+        'by type (30 days)': lambda: backend.aggregate(
+            month, end, by=['type'], clicks=('clicks', 'sum'), ctr=('ctr', 'mean')),
+        'weekly series by type': lambda: backend.aggregate(
+            by=['week', 'type'], clicks=('clicks', 'sum')),
+        'daily series, one section': lambda: backend.aggregate(
+            quarter, end, by=['date', 'type'], section=section, clicks=('clicks', 'sum')),
+        'page totals (90 days)': lambda: backend.page_totals(quarter, end),
+        'ctr rows (30 days)': lambda: backend.rows(month, end, ['type', 'ctr']),
+    }
+
+def run(data_path, repeat):
+    results = {}
+    for name in BACKENDS:
+        store = DataStore()
+        started = time.perf_counter()
+        store.load_data(data_path, backend=name)
+        load_time = time.perf_counter() - started
+        print(f"{name}: loaded in {load_time:.2f}s")
+
+        for query, fn in benchmark_queries(store).items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - started)
+            results.setdefault(query, {})[name] = statistics.median(timings)
+
+    print()
+    print(f"{'query':<30}" + ''.join(f"{name:>12}" for name in BACKENDS) + '   (median ms)')
+    for query, timings in results.items():
+        print(f"{query:<30}" + ''.join(f"{timings[name] * 1000:>12.1f}" for name in BACKENDS))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare query backends on the same data")
+    parser.add_argument('--data', help="CSV to load; synthetic data is generated when omitted")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.data:
+        run(args.data, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(generate(os.path.join(tmp, 'synthetic.csv'), rows=args.rows), args.repeat)
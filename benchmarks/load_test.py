@@ -0,0 +1,327 @@
+# benchmarks/load_test.py
+"""Concurrent-user load test against the gunicorn deployment.
+
+Boots the app under gunicorn_config.py on synthetic data (or targets an
+already running server with --url) and has each simulated analyst replay
+the callback sequences the browser sends to /_dash-update-component: page
+loads, date-range drags and metric toggles. Reports throughput, latency
+percentiles per callback and error/timeout rates.
+
+    python -m benchmarks.load_test --users 50 --duration 60
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_data import generate
+
+class DashClient:
+    """Issue Dash callback requests the way the renderer does"""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.callbacks = {}
+
+    def request(self, path, body=None):
+        data = None if body is None else json.dumps(body).encode()
+        req = urllib.request.Request(
+            self.base_url + path, data=data,
+            headers={'Content-Type': 'application/json'} if data else {}
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            return response.status, response.read()
+
+    def load_dependencies(self):
+        _, body = self.request('/_dash-dependencies')
+        for dependency in json.loads(body):
+            self.callbacks[dependency['output']] = dependency
+
+    def find_callback(self, output):
+        """Find the callback that writes to an 'id.property' output"""
+        for key, dependency in self.callbacks.items():
+            if output in key.strip('.').split('...'):
+                return dependency
+        raise KeyError(f"No callback writes {output}")
+
+    def fire(self, output, values, changed):
+        """Fire the callback for output with input values keyed by 'id.property'"""
+        dependency = self.find_callback(output)
+        inputs = [
+            {'id': i['id'], 'property': i['property'], 'value': values.get(f"{i['id']}.{i['property']}")}
+            for i in dependency['inputs']
+        ]
+        state = [
+            {'id': s['id'], 'property': s['property'], 'value': values.get(f"{s['id']}.{s['property']}")}
+            for s in dependency['state']
+        ]
+        outputs = [
+            dict(zip(('id', 'property'), part.rsplit('.', 1)))
+            for part in dependency['output'].strip('.').split('...')
+        ]
+        return self.request('/_dash-update-component', {
+            'output': dependency['output'],
+            'outputs': outputs if dependency['output'].startswith('..') else outputs[0],
+            'inputs': inputs,
+            'state': state,
+            'changedPropIds': list(changed)
+        })
+
+class Scenarios:
+    """Realistic analyst sessions expressed as callback sequences"""
+
+    def __init__(self, min_date, max_date, sections, rng):
+        self.min_date = min_date
+        self.max_date = max_date
+        self.sections = [None] + sections
+        self.rng = rng
+
+    def date_range(self, min_days=7):
+        span = (self.max_date - self.min_date).days
+        length = int(self.rng.integers(min_days, max(span, min_days + 1)))
+        start = self.min_date + pd.Timedelta(days=int(self.rng.integers(0, max(span - length, 1))))
+        return str(start.date()), str(min(start + pd.Timedelta(days=length), self.max_date).date())
+
+    def page_load(self, path):
+        return [('page load', '_pages_content.children',
+                 {'_pages_location.pathname': path, '_pages_location.search': ''},
+                 ['_pages_location.pathname'])]
+
+    def overview(self):
+        section = self.rng.choice(self.sections)
+        steps = self.page_load('/')
+        for i in range(3):
+            start, end = (str(self.min_date.date()), str(self.max_date.date())) if i == 0 else self.date_range()
+            steps.append(('overview: date range', 'metric-cards.children', {
+                'overview-date-range.start_date': start,
+                'overview-date-range.end_date': end,
+                'section-filter.value': section
+            }, ['overview-date-range.start_date']))
+        return steps
+
+    def detailed_metrics(self):
+        steps = self.page_load('/detailed-metrics')
+        for i in range(2):
+            start, end = (str(self.min_date.date()), str(self.max_date.date())) if i == 0 else self.date_range()
+            steps.append(('detailed: date range', 'detailed-metrics-graph.figure', {
+                'detailed-date-range.start_date': start,
+                'detailed-date-range.end_date': end,
+                'section-filter.value': None
+            }, ['detailed-date-range.end_date']))
+        return steps
+
+    def time_analysis(self):
+        steps = self.page_load('/time-analysis')
+        values = {
+            'metric-selector.value': 'clicks',
+            'time-aggregation.value': 'D',
+            'show-ma.value': [],
+            'ma-window.value': 7,
+            'trend-view.value': 'wow',
+            'section-filter.value': None
+        }
+        steps.append(('time analysis: toggle', 'time-series-plot.figure', dict(values), ['metric-selector.value']))
+        steps.append(('time analysis: trend', 'trend-plot.figure', dict(values), ['metric-selector.value']))
+        for _ in range(3):
+            prop = self.rng.choice(['metric-selector.value', 'time-aggregation.value', 'show-ma.value', 'ma-window.value'])
+            if prop == 'metric-selector.value':
+                values[prop] = self.rng.choice(['clicks', 'impressions', 'ctr'])
+            elif prop == 'time-aggregation.value':
+                values[prop] = self.rng.choice(['D', 'W', 'M'])
+            elif prop == 'ma-window.value':
+                values[prop] = int(self.rng.choice([7, 28, 90]))
+            else:
+                values[prop] = [] if values[prop] else ['yes']
+            steps.append(('time analysis: toggle', 'time-series-plot.figure', dict(values), [prop]))
+        return steps
+
+    def page_metrics(self):
+        steps = self.page_load('/page-metrics')
+        start, end = self.date_range(min_days=28)
+        for page in range(3):
+            steps.append(('page metrics: paging', 'page-metrics-table.data', {
+                'page-metrics-date-range.start_date': start,
+                'page-metrics-date-range.end_date': end,
+                'page-metrics-table.page_current': page,
+                'page-metrics-table.page_size': 25,
+                'page-metrics-table.sort_by': [{'column_id': 'clicks', 'direction': 'desc'}],
+                'page-metrics-table.filter_query': '',
+                'section-filter.value': None
+            }, ['page-metrics-table.page_current']))
+        return steps
+
+    def session(self):
+        scenario = self.rng.choice([self.overview, self.detailed_metrics, self.time_analysis, self.page_metrics])
+        return scenario()
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.timeouts = {}
+
+    def record(self, label, elapsed=None, error=False, timeout=False):
+        with self.lock:
+            self.latencies.setdefault(label, [])
+            if elapsed is not None:
+                self.latencies[label].append(elapsed)
+            if error:
+                self.errors[label] = self.errors.get(label, 0) + 1
+            if timeout:
+                self.timeouts[label] = self.timeouts.get(label, 0) + 1
+
+    def report(self, wall_time):
+        completed = sum(len(v) for v in self.latencies.values())
+        errors = sum(self.errors.values())
+        timeouts = sum(self.timeouts.values())
+        attempted = completed + errors + timeouts
+        print(f"\n{attempted:,} requests in {wall_time:.1f}s: {completed / wall_time:.1f} req/s completed, "
+              f"{errors / max(attempted, 1):.2%} errors, {timeouts / max(attempted, 1):.2%} timeouts\n")
+        print(f"{'callback':<28}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'timeouts':>10}")
+        for label in sorted(self.latencies):
+            values = np.array(self.latencies[label]) * 1000
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) if len(values) else (np.nan,) * 3
+            print(f"{label:<28}{len(values):>8}{p50:>10.0f}{p95:>10.0f}{p99:>10.0f}"
+                  f"{self.errors.get(label, 0):>8}{self.timeouts.get(label, 0):>10}")
+
+def simulate_user(client, scenarios, results, deadline, think_time):
+    while time.monotonic() < deadline:
+        for label, output, values, changed in scenarios.session():
+            if time.monotonic() >= deadline:
+                return
+            started = time.perf_counter()
+            try:
+                status, _ = client.fire(output, values, changed)
+                if status in (200, 204):
+                    results.record(label, time.perf_counter() - started)
+                else:
+                    results.record(label, error=True)
+            except (socket.timeout, TimeoutError):
+                results.record(label, timeout=True)
+            except urllib.error.URLError as e:
+                if isinstance(e.reason, (socket.timeout, TimeoutError)):
+                    results.record(label, timeout=True)
+                else:
+                    results.record(label, error=True)
+            except Exception:
+                results.record(label, error=True)
+            time.sleep(scenarios.rng.uniform(*think_time))
+
+def find_component(tree, component_id):
+    """Depth-first search of a serialized layout for a component id"""
+    if isinstance(tree, dict):
+        if tree.get('props', {}).get('id') == component_id:
+            return tree
+        children = tree.values()
+    elif isinstance(tree, list):
+        children = tree
+    else:
+        return None
+    for child in children:
+        found = find_component(child, component_id)
+        if found is not None:
+            return found
+    return None
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(data_path, port, backend, gunicorn_args, boot_timeout):
+    """Boot app:server under gunicorn_config.py and wait until it answers"""
+    env = dict(os.environ, DASHBOARD_DATA=data_path, DASHBOARD_BACKEND=backend)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_config.py',
+         '--bind', f'127.0.0.1:{port}', *gunicorn_args, 'app:server'],
+        cwd=ROOT, env=env
+    )
+    deadline = time.monotonic() + boot_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/_dash-layout', timeout=5)
+            return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"gunicorn did not answer within {boot_timeout}s")
+
+def run(args, base_url):
+    client = DashClient(base_url, args.timeout)
+    client.load_dependencies()
+
+    # Date bounds and sections come from the layouts the server renders
+    _, body = client.request('/_dash-layout')
+    section_filter = find_component(json.loads(body), 'section-filter')
+    sections = [option['value'] for option in section_filter['props']['options']]
+    _, body = client.fire(
+        '_pages_content.children', {'_pages_location.pathname': '/', '_pages_location.search': ''},
+        ['_pages_location.pathname'])
+    date_picker = find_component(json.loads(body), 'overview-date-range')
+    dates = pd.to_datetime([date_picker['props']['min_date_allowed'], date_picker['props']['max_date_allowed']])
+
+    results = Results()
+    deadline = time.monotonic() + args.duration
+    users = [
+        threading.Thread(
+            target=simulate_user,
+            args=(client, Scenarios(dates.min(), dates.max(), sections, np.random.default_rng(args.seed + i)),
+                  results, deadline, (args.think_min, args.think_max)),
+            daemon=True
+        )
+        for i in range(args.users)
+    ]
+    started = time.perf_counter()
+    for user in users:
+        user.start()
+        time.sleep(args.ramp_up / max(args.users, 1))
+    for user in users:
+        user.join()
+    results.report(time.perf_counter() - started)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay concurrent analyst sessions against the dashboard")
+    parser.add_argument('--url', help="Target an already running server instead of booting one")
+    parser.add_argument('--data', help="CSV to serve; synthetic data is generated when omitted")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Rows of synthetic data")
+    parser.add_argument('--backend', default='pandas', choices=['pandas', 'sqlite'])
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=60, help="Seconds to run")
+    parser.add_argument('--ramp-up', type=float, default=5, help="Seconds over which users start")
+    parser.add_argument('--think-min', type=float, default=0.5)
+    parser.add_argument('--think-max', type=float, default=2.0)
+    parser.add_argument('--timeout', type=float, default=120, help="Client timeout per request")
+    parser.add_argument('--boot-timeout', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args, gunicorn_args = parser.parse_known_args()
+
+    if args.url:
+        run(args, args.url)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = args.data or generate(os.path.join(tmp, 'synthetic.csv'), rows=args.rows)
+            port = free_port()
+            print(f"Booting gunicorn on port {port} ({' '.join(gunicorn_args) or 'gunicorn_config.py defaults'})")
+            server = start_server(os.path.abspath(data_path), port, args.backend, gunicorn_args, args.boot_timeout)
+            try:
+                run(args, f'http://127.0.0.1:{port}')
+            finally:
+                server.terminate()
+                server.wait()
@@ -0,0 +1,45 @@
+# benchmarks/synthetic_data.py
+import argparse
+import numpy as np
+import pandas as pd
+
+SECTIONS = ['blog', 'courses', 'landing', 'shop']
+
+def generate(path, rows=1_000_000, pages=20_000, days=540, seed=0):
+    """Write a Search Console style CSV with the columns the dashboard expects"""
+    rng = np.random.default_rng(seed)
+
+    section = rng.integers(0, len(SECTIONS), pages)
+    urls = np.array([
+        f"https://example.com/{SECTIONS[s]}/{SECTIONS[s]}-page-{i}/" for i, s in enumerate(section)
+    ])
+    # Skew traffic so a few pages get most of the rows, like real properties
+    weights = rng.pareto(1.2, pages) + 1
+    page_idx = rng.choice(pages, size=rows, p=weights / weights.sum())
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq='D')
+    date_idx = rng.integers(0, days, rows)
+
+    impressions = rng.integers(1, 500, rows)
+    clicks = rng.binomial(impressions, 0.05)
+
+    df = pd.DataFrame({
+        'date': dates[date_idx].strftime('%Y-%m-%d'),
+        'page': urls[page_idx],
+        'type': np.array(SECTIONS)[section[page_idx]],
+        'clicks': clicks,
+        'impressions': impressions,
+        'ctr': clicks / impressions,
+        'position': rng.uniform(1, 50, rows).round(2)
+    })
+    df.to_csv(path, index=False)
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate synthetic dashboard data")
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--pages', type=int, default=20_000)
+    parser.add_argument('--days', type=int, default=540)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate(args.path, args.rows, args.pages, args.days, args.seed)
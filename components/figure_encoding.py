@@ -0,0 +1,201 @@
+# components/figure_encoding.py
+import base64
+import functools
+import logging
+import os
+import threading
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+from dash import callback_context
+from dash.development.base_component import Component
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Arrays shorter than this are cheaper to leave as JSON
+BINARY_MIN_LENGTH = int(os.environ.get('DASHBOARD_BINARY_MIN_LENGTH', 100))
+BINARY_FIGURES = os.environ.get('DASHBOARD_BINARY_FIGURES', '1') != '0'
+# Elements serialized to estimate an array's JSON size for the savings stats
+JSON_SAMPLE_SIZE = 1000
+# Trace attributes whose dates plotly.js reads through a date axis
+DATE_KEYS = ('x', 'y')
+
+# numpy dtypes plotly.js can decode from a typed-array spec
+TYPED_ARRAY_DTYPES = {'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+                      'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8'}
+
+# Let plotly serialize the rest of each response with orjson
+if orjson is not None:
+    pio.json.config.default_engine = 'orjson'
+
+encoding_stats = {}
+_stats_lock = threading.Lock()
+
+def json_size(value):
+    """Size in bytes of a value serialized the way Dash sends it"""
+    return len(to_json_plotly(value))
+
+def estimate_json_size(values):
+    """Estimate an array's JSON size from an evenly strided sample of its elements"""
+    flat = values.ravel()
+    if flat.size <= JSON_SAMPLE_SIZE:
+        return json_size(values)
+    sample = flat[::-(-flat.size // JSON_SAMPLE_SIZE)]
+    return int(json_size(sample) * flat.size / sample.size)
+
+def spec_size(spec):
+    """Size in bytes of a typed-array spec without serializing its payload again"""
+    return json_size({**spec, 'bdata': ''}) + len(spec['bdata'])
+
+def to_typed_array(values, dates=False):
+    """Return values as a numeric ndarray of a plotly.js typed-array dtype, or None.
+
+    Dates become epoch milliseconds, which plotly.js only reads back as dates
+    on a date axis, so they are converted only when dates is true. Object
+    arrays are converted only when every element is a datetime.
+    """
+    if values.dtype == object:
+        if not dates or pd.api.types.infer_dtype(values, skipna=True) not in ('datetime', 'datetime64', 'date'):
+            return None
+        values = pd.to_datetime(values).values
+
+    if values.dtype.kind == 'M':
+        if not dates:
+            return None
+        # Date axes read plain numbers as milliseconds since the epoch
+        millis = values.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+        millis[np.isnat(values)] = np.nan
+        return millis
+    if values.dtype.kind == 'b':
+        return values.astype(np.uint8)
+    if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        if len(values) and np.iinfo(np.int32).min <= values.min() and values.max() <= np.iinfo(np.int32).max:
+            return values.astype(np.int32)
+        return values.astype(np.float64)
+    if values.dtype.name in TYPED_ARRAY_DTYPES:
+        return values
+    if values.dtype.kind == 'f':
+        return values.astype(np.float64)
+    return None
+
+def encode_array(values, dates=False):
+    """Encode an array as a plotly.js typed-array spec.
+
+    Returns (spec, is_date), or (None, False) when the array should stay JSON.
+    """
+    if values.size < BINARY_MIN_LENGTH or values.ndim > 2:
+        return None, False
+    typed = to_typed_array(values.ravel() if values.dtype == object else values, dates)
+    if typed is None:
+        return None, False
+    if values.dtype == object:
+        typed = typed.reshape(values.shape)
+
+    typed = np.ascontiguousarray(typed)
+    spec = {
+        'dtype': TYPED_ARRAY_DTYPES[typed.dtype.name],
+        'bdata': base64.b64encode(typed.tobytes()).decode('ascii')
+    }
+    if typed.ndim == 2:
+        spec['shape'] = f'{typed.shape[0]},{typed.shape[1]}'
+    return spec, values.dtype.kind == 'M' or values.dtype == object
+
+def encode_trace(trace, date_axes, savings, nested=False):
+    """Replace large numeric arrays in a trace dict, recursing into nested attributes.
+
+    Dates are only encoded for the trace's own x and y, whose axes are then
+    pinned to type 'date'; elsewhere (customdata, text, ...) they stay JSON.
+    """
+    for key, value in trace.items():
+        if isinstance(value, dict):
+            encode_trace(value, date_axes, savings, nested=True)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    encode_trace(item, date_axes, savings, nested=True)
+        elif isinstance(value, np.ndarray):
+            on_axis = not nested and key in DATE_KEYS
+            spec, is_date = encode_array(value, dates=on_axis)
+            if spec is None:
+                continue
+            savings[0] += estimate_json_size(value)
+            savings[1] += spec_size(spec)
+            trace[key] = spec
+            if is_date:
+                date_axes.add(key)
+
+def encode_figure(fig):
+    """Return a figure dict with large numeric and datetime arrays base64-encoded.
+
+    The second value is (json_bytes, binary_bytes) for the encoded arrays;
+    json_bytes is estimated from a sample of each array.
+    """
+    figure = fig.to_dict() if isinstance(fig, go.Figure) else fig
+    savings = [0, 0]
+    layout = figure.setdefault('layout', {})
+    for trace in figure.get('data', []):
+        date_axes = set()
+        encode_trace(trace, date_axes, savings)
+        for axis in date_axes:
+            # 'x2' on the trace refers to 'xaxis2' in the layout
+            ref = trace.get(f'{axis}axis', axis)
+            layout.setdefault(f'{axis}axis{ref[1:]}', {}).setdefault('type', 'date')
+    return figure, tuple(savings)
+
+def record_savings(name, json_bytes, binary_bytes):
+    with _stats_lock:
+        stats = encoding_stats.setdefault(name, {'calls': 0, 'json_bytes': 0, 'binary_bytes': 0})
+        stats['calls'] += 1
+        stats['json_bytes'] += json_bytes
+        stats['binary_bytes'] += binary_bytes
+    logger.info("%s: encoded %d bytes of figure arrays as %d (%d saved)",
+                name, json_bytes, binary_bytes, json_bytes - binary_bytes)
+
+def binary_figures(func):
+    """Callback decorator that sends returned figures with binary typed arrays.
+
+    Figures are found in the outputs themselves and in the figure prop of any
+    component returned as children (e.g. a list of dcc.Graph rows). Estimated
+    bytes saved are added to encoding_stats, logged, and reported to the
+    browser in the X-Figure-Bytes-Saved response header.
+    """
+    if not BINARY_FIGURES:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        totals = [0, 0]
+
+        def encode(value):
+            if isinstance(value, go.Figure):
+                figure, (json_bytes, binary_bytes) = encode_figure(value)
+                totals[0] += json_bytes
+                totals[1] += binary_bytes
+                return figure
+            if isinstance(value, (tuple, list)):
+                return type(value)(encode(item) for item in value)
+            if isinstance(value, Component):
+                for component in (value, *value._traverse()):
+                    if isinstance(getattr(component, 'figure', None), go.Figure):
+                        component.figure = encode(component.figure)
+            return value
+
+        result = encode(result)
+
+        record_savings(func.__name__, *totals)
+        try:
+            callback_context.response.headers['X-Figure-Bytes-Saved'] = str(totals[0] - totals[1])
+        except Exception:
+            # Called outside a Dash request, e.g. from a script
+            pass
+        return result
+
+    return wrapper
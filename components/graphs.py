@@ -1,16 +1,59 @@
 # components/graphs.py
-import plotly.express as px
+import numpy as np
+import pandas as pd
+from lazy_imports import lazy_module
+px = lazy_module('plotly.express')
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+subplots = lazy_module('plotly.subplots')
 from data_processor import COLORS
 
+WEBGL_THRESHOLD = 1000  # Switch scatter traces to WebGL above this many points
+POINT_BUDGET = 20000    # Maximum rows sent to the browser by point-heavy charts
+MIN_STRATUM_POINTS = 100
+
+def scatter_trace(n_points, webgl_threshold=WEBGL_THRESHOLD):
+    """Return the scatter trace type to use for a given number of points"""
+    return go.Scattergl if n_points > webgl_threshold else go.Scatter
+
+def stratified_sample(df, max_points=POINT_BUDGET, by='type', random_state=0):
+    """Sample at most max_points rows, allocated to each group in proportion to its size.
+
+    Every group first gets a floor of up to MIN_STRATUM_POINTS rows so small
+    groups stay visible next to large ones; the rest of the budget is shared
+    out proportionally.
+    """
+    if len(df) <= max_points:
+        return df
+
+    sizes = df.groupby(by).size()
+    floors = np.minimum(sizes, min(MIN_STRATUM_POINTS, max_points // len(sizes)))
+    remaining = max(max_points - floors.sum(), 0)
+    quotas = floors + ((sizes - floors) * remaining / (sizes - floors).sum()).astype(int)
+    return pd.concat([
+        group.sample(n=int(quotas[name]), random_state=random_state)
+        for name, group in df.groupby(by)
+    ])
+
+def annotate_sample(fig, shown, total, by='type'):
+    """Label a figure that only shows a sample of its data"""
+    fig.add_annotation(
+        text=f"Showing a sample of {shown:,} of {total:,} points, stratified by {by}",
+        xref='paper', yref='paper',
+        x=1, y=1.08,
+        xanchor='right',
+        showarrow=False,
+        font=dict(size=11, color='#666')
+    )
+    return fig
+
 def create_multi_metric_chart(df, metrics, title="Multi-Metric Analysis"):
     """Create a chart with multiple metrics using secondary axis"""
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = subplots.make_subplots(specs=[[{"secondary_y": True}]])
     
+    trace = scatter_trace(len(df))
     for i, metric in enumerate(metrics):
         fig.add_trace(
-            go.Scatter(
+            trace(
                 x=df['date'],
                 y=df[metric],
                 name=metric.capitalize(),
@@ -64,10 +107,13 @@ def create_sunburst(df, path, values, title="Hierarchical View"):
     
     return fig
 
-def create_scatter_matrix(df, dimensions, title="Scatter Matrix"):
+def create_scatter_matrix(df, dimensions, title="Scatter Matrix", max_points=POINT_BUDGET):
     """Create a scatter matrix for multiple dimensions"""
+    sample = stratified_sample(df, max_points, by='type')
+
+    # px.scatter_matrix renders through the WebGL splom trace
     fig = px.scatter_matrix(
-        df,
+        sample,
         dimensions=dimensions,
         color='type',
         color_discrete_sequence=COLORS,
@@ -78,6 +124,76 @@ def create_scatter_matrix(df, dimensions, title="Scatter Matrix"):
         dragmode='select',
         hovermode='closest'
     )
+
+    if len(sample) < len(df):
+        annotate_sample(fig, len(sample), len(df), by='type')
+    
+    return fig
+
+def box_statistics(df, x, y):
+    """Exact per-category quartiles, fences, mean and count of column y"""
+    stats = []
+    for name, values in df.groupby(x)[y]:
+        values = values.dropna().to_numpy()
+        if not len(values):
+            continue
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        stats.append({
+            x: name,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': values[values >= q1 - 1.5 * iqr].min(),
+            'upperfence': values[values <= q3 + 1.5 * iqr].max(),
+            'mean': values.mean(),
+            'count': len(values)
+        })
+    return pd.DataFrame(stats, columns=[x, 'q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'count'])
+
+def create_box_plot(df, x, y, title="Distribution", max_points=POINT_BUDGET):
+    """Create a box plot per category, sending precomputed statistics for large data"""
+    if len(df) <= max_points:
+        return px.box(
+            df,
+            x=x,
+            y=y,
+            color=x,
+            title=title,
+            color_discrete_sequence=COLORS
+        )
+    return create_box_plot_from_statistics(box_statistics(df, x, y), x, y, title)
+
+def create_box_plot_from_statistics(stats, x, y, title="Distribution"):
+    """Create a box plot from the per-category frame returned by box_statistics"""
+    fig = go.Figure()
+    for i, row in enumerate(stats.to_dict('records')):
+        fig.add_trace(go.Box(
+            name=str(row[x]),
+            x=[row[x]],
+            q1=[row['q1']],
+            median=[row['median']],
+            q3=[row['q3']],
+            lowerfence=[row['lowerfence']],
+            upperfence=[row['upperfence']],
+            mean=[row['mean']],
+            marker_color=COLORS[i % len(COLORS)]
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title=x,
+        yaxis_title=y,
+        legend_title_text=x
+    )
+    fig.add_annotation(
+        text=f"Box statistics computed from {stats['count'].sum():,} points; outliers not drawn",
+        xref='paper', yref='paper',
+        x=1, y=1.08,
+        xanchor='right',
+        showarrow=False,
+        font=dict(size=11, color='#666')
+    )
     
     return fig
 
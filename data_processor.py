@@ -1,21 +1,54 @@
 # data_processor.py
+import numpy as np
 import pandas as pd
 from data_store import data_store
+from query_backend import TIME_KEYS
+from parallel_aggregation import parallel_aggregate
 
-def calculate_metrics(df):
-    """Calculate basic metrics from the data"""
+def calculate_metrics(start_date, end_date, section=None):
+    """Calculate basic metrics for a date range"""
+    totals = parallel_aggregate(
+        start_date, end_date, section=section,
+        clicks=('clicks', 'sum'),
+        impressions=('impressions', 'sum'),
+        position=('position', 'mean'),
+        pages=('page_id', 'nunique')
+    ).to_dict('records')[0]
     metrics = {
-        'total_clicks': df['clicks'].sum(),
-        'total_impressions': df['impressions'].sum(),
-        'avg_ctr': (df['clicks'].sum() / df['impressions'].sum()) * 100,
-        'avg_position': df['position'].mean(),
-        'total_pages': df['page'].nunique()
+        'total_clicks': totals['clicks'],
+        'total_impressions': totals['impressions'],
+        'avg_ctr': (totals['clicks'] / totals['impressions']) * 100 if totals['impressions'] else float('nan'),
+        'avg_position': totals['position'],
+        'total_pages': totals['pages']
     }
     return metrics
 
-def get_time_series_data(df, metric='clicks', freq='D'):
+def get_time_series_data(metric='clicks', freq='D', section=None):
     """Aggregate data by time frequency"""
-    return df.groupby([pd.Grouper(key='date', freq=freq), 'type'])[metric].sum().reset_index()
+    key = TIME_KEYS[freq]
+    return data_store.backend.aggregate(
+        by=[key, 'type'], section=section, **{metric: (metric, 'sum')}
+    ).rename(columns={key: 'date'})
+
+def top_k(df, column, k, ascending=False):
+    """Return the top k rows ordered by column using a partial sort.
+
+    Ties keep the frame's row order and missing values sort last, exactly
+    like a stable sort_values, so consecutive values of k page consistently.
+    """
+    if k <= 0:
+        return df.iloc[0:0]
+    if k >= len(df) or not pd.api.types.is_numeric_dtype(df[column]):
+        return df.sort_values(column, ascending=ascending, kind='stable').head(k)
+    values = df[column].to_numpy(dtype=float)
+    if not ascending:
+        values = -values
+    values[np.isnan(values)] = np.inf
+    # Every row tied with the k-th value is a candidate, so the tie break below sees them all
+    kth = np.partition(values, k - 1)[k - 1]
+    candidates = np.flatnonzero(values <= kth)
+    ordered = candidates[np.lexsort((candidates, values[candidates]))][:k]
+    return df.iloc[ordered]
 
 COLORS = ['#0d0887', '#46039f', '#7201a8', '#9c179e', '#bd3786', 
           '#d8576b', '#ed7953', '#fb9f3a', '#fdca26', '#f0f921']
\ No newline at end of file
@@ -1,14 +1,98 @@
 # data_store.py
+import os
+import numpy as np
 import pandas as pd
+from query_backend import PandasBackend, SQLiteBackend, CSV_CHUNK_SIZE
+
+BACKENDS = ('pandas', 'sqlite')
 
 class DataStore:
     def __init__(self):
         self.df = None
+        self.backend = None
+        self.pages = None
+        self.page_types = None
+        self.sections = []
+        self.min_date = None
+        self.max_date = None
+        # Bumped on every load so caches keyed on it never serve stale results
+        self.version = 0
+
+    def load_data(self, file_path, backend='pandas', db_path=None):
+        """Load a CSV export into the chosen query backend.
+
+        The pandas backend keeps every row in memory; the sqlite backend
+        streams the CSV into an indexed database at db_path (reused while it
+        is newer than the CSV) and keeps only page metadata in memory.
+        """
+        if backend == 'pandas':
+            self.load_pandas(file_path)
+        elif backend == 'sqlite':
+            self.load_sqlite(file_path, db_path or os.path.splitext(file_path)[0] + '.sqlite')
+        else:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
 
-    def load_data(self, file_path):
-        self.df = pd.read_csv(file_path)
-        self.df['date'] = pd.to_datetime(self.df['date'])
+        bounds = self.backend.aggregate(first=('date', 'min'), last=('date', 'max'))
+        self.min_date = pd.Timestamp(bounds['first'].iloc[0])
+        self.max_date = pd.Timestamp(bounds['last'].iloc[0])
+        self.version += 1
         return self.df
 
+    def load_pandas(self, file_path):
+        df = pd.read_csv(file_path)
+        df['date'] = pd.to_datetime(df['date'])
+        # Keep rows in date order so date ranges are contiguous slices
+        df = df.sort_values('date', kind='stable').reset_index(drop=True)
+        codes, self.pages = pd.factorize(df['page'], sort=True)
+        df['page_id'] = codes
+        self.page_types = df.groupby('page_id')['type'].first()
+        self.build_path_index()
+        self.df = df
+        self.backend = PandasBackend(self, df)
+
+    def load_sqlite(self, file_path, db_path):
+        if os.path.exists(db_path) and os.path.getmtime(db_path) >= os.path.getmtime(file_path):
+            backend = SQLiteBackend(self, db_path)
+            pages = backend.query('SELECT page, type FROM pages ORDER BY page_id')
+            self.pages = pd.Index(pages['page'])
+            self.page_types = pages['type']
+            self.build_path_index()
+        else:
+            page_types = pd.concat(
+                chunk.drop_duplicates('page')
+                for chunk in pd.read_csv(file_path, usecols=['page', 'type'], chunksize=CSV_CHUNK_SIZE)
+            ).drop_duplicates('page').set_index('page')['type'].sort_index()
+            self.pages = pd.Index(page_types.index)
+            self.page_types = pd.Series(page_types.values)
+            self.build_path_index()
+            SQLiteBackend.build(file_path, db_path, self.pages, self.page_types, self.path_rank)
+            backend = SQLiteBackend(self, db_path)
+
+        self.df = None
+        self.backend = backend
+
+    def build_path_index(self):
+        """Index pages by URL path so any path prefix resolves with one binary search.
+
+        Page ids are ordered by path, which turns every prefix into a contiguous
+        range of ranks; backends store that rank with each row so the same range
+        also selects the section's rows.
+        """
+        paths = pd.Series(self.pages).str.replace(r'^[A-Za-z][A-Za-z0-9+.-]*://[^/]*', '', regex=True)
+        paths = paths.where(paths != '', '/').to_numpy(dtype=object)
+
+        self.path_order = np.argsort(paths, kind='stable')
+        self.sorted_paths = paths[self.path_order]
+        self.path_rank = np.empty(len(paths), dtype=np.int64)
+        self.path_rank[self.path_order] = np.arange(len(paths))
+
+        self.sections = sorted(pd.Series(self.sorted_paths).str.extract(r'^(/[^/]+/)')[0].dropna().unique())
+
+    def section_range(self, prefix):
+        """Return the [lo, hi) range of path ranks whose path starts with prefix"""
+        lo = np.searchsorted(self.sorted_paths, prefix, side='left')
+        hi = np.searchsorted(self.sorted_paths, prefix + '\U0010ffff', side='left')
+        return lo, hi
+
 # Create a global instance
-data_store = DataStore()
\ No newline at end of file
+data_store = DataStore()
@@ -1,6 +1,32 @@
 # gunicorn_config.py
+# Installed first so the profile covers everything imported at startup
+import startup_profile
+startup_profile.install(defer_report=True)
+
+import gc
+import lazy_imports
+
 bind = "0.0.0.0:10000"
 workers = 2
 threads = 4
 worker_class = "gthread"
-timeout = 120
\ No newline at end of file
+timeout = 120
+
+# Import the app and load the data once in the master; forked workers share
+# those pages copy-on-write instead of each loading their own copy
+preload_app = True
+
+def when_ready(server):
+    # Finish the lazy imports before forking so workers don't repeat them,
+    # then move everything loaded so far out of the collector's reach: the
+    # collector touching those objects would copy their pages into each worker
+    with startup_profile.phase('warm lazy imports'):
+        lazy_imports.warm()
+    gc.freeze()
+    startup_profile.report()
+
+def post_fork(server, worker):
+    # Fork the aggregation pool before the worker starts its request threads.
+    # Imported here so reading the config never pulls in pandas and the data store
+    import parallel_aggregation
+    parallel_aggregation.start_pool()
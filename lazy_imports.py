@@ -0,0 +1,41 @@
+# lazy_imports.py
+import importlib
+import threading
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    Safe to share between gunicorn threads: the import happens once, under a lock.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+_modules = {}
+
+def lazy_module(name):
+    """Return a shared lazy proxy for the named module"""
+    if name not in _modules:
+        _modules[name] = LazyModule(name)
+    return _modules[name]
+
+def warm():
+    """Import every lazily declared module now, e.g. in the gunicorn master before forking"""
+    for module in list(_modules.values()):
+        module.load()
@@ -1,13 +1,12 @@
 # pages/comparison.py
 import dash
 from dash import html, dcc, callback, Input, Output
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import dash_bootstrap_components as dbc
 from data_processor import COLORS
 import pandas as pd
 from data_store import data_store
+from components.figure_encoding import binary_figures
 
 dash.register_page(__name__, path='/comparison', name='Comparison')
 
@@ -22,10 +21,10 @@ layout = html.Div([
                 html.H4("Period 1"),
                 dcc.DatePickerRange(
                     id='period1-date-range',
-                    min_date_allowed=data_store.df['date'].min(),
-                    max_date_allowed=data_store.df['date'].max(),
-                    start_date=data_store.df['date'].min(),
-                    end_date=data_store.df['date'].min() + pd.Timedelta(days=30),
+                    min_date_allowed=data_store.min_date,
+                    max_date_allowed=data_store.max_date,
+                    start_date=data_store.min_date,
+                    end_date=data_store.min_date + pd.Timedelta(days=30),
                     className="mb-3"
                 )
             ], width=6),
@@ -34,10 +33,10 @@ layout = html.Div([
                 html.H4("Period 2"),
                 dcc.DatePickerRange(
                     id='period2-date-range',
-                    min_date_allowed=data_store.df['date'].min(),
-                    max_date_allowed=data_store.df['date'].max(),
-                    start_date=data_store.df['date'].max() - pd.Timedelta(days=30),
-                    end_date=data_store.df['date'].max(),
+                    min_date_allowed=data_store.min_date,
+                    max_date_allowed=data_store.max_date,
+                    start_date=data_store.max_date - pd.Timedelta(days=30),
+                    end_date=data_store.max_date,
                     className="mb-3"
                 )
             ], width=6)
@@ -80,17 +79,12 @@ layout = html.Div([
      Input('period1-date-range', 'end_date'),
      Input('period2-date-range', 'start_date'),
      Input('period2-date-range', 'end_date'),
-     Input('metrics-to-compare', 'value')]
+     Input('metrics-to-compare', 'value'),
+     Input('section-filter', 'value')]
 )
-def update_comparison(p1_start, p1_end, p2_start, p2_end, metrics):
-    df = data_store.df
-    
-    # Filter data for both periods
-    p1_mask = (df['date'] >= p1_start) & (df['date'] <= p1_end)
-    p2_mask = (df['date'] >= p2_start) & (df['date'] <= p2_end)
-    
-    p1_data = df[p1_mask]
-    p2_data = df[p2_mask]
+@binary_figures
+def update_comparison(p1_start, p1_end, p2_start, p2_end, metrics, section):
+    backend = data_store.backend
     
     graphs = []
     summary_data = []
@@ -98,8 +92,10 @@ def update_comparison(p1_start, p1_end, p2_start, p2_end, metrics):
     # Create comparison graphs for each metric
     for metric in metrics:
         # Calculate daily averages for each period
-        p1_avg = p1_data.groupby('type')[metric].mean().reset_index()
-        p2_avg = p2_data.groupby('type')[metric].mean().reset_index()
+        p1_avg = backend.aggregate(p1_start, p1_end, by=['type'], section=section,
+                                   **{metric: (metric, 'mean')})
+        p2_avg = backend.aggregate(p2_start, p2_end, by=['type'], section=section,
+                                   **{metric: (metric, 'mean')})
         
         # Create comparison bar chart
         fig = go.Figure()
@@ -132,7 +128,7 @@ def update_comparison(p1_start, p1_end, p2_start, p2_end, metrics):
         ]))
         
         # Calculate summary statistics
-        for type_name in df['type'].unique():
+        for type_name in p1_avg['type'][p1_avg['type'].isin(p2_avg['type'])]:
             p1_type_avg = p1_avg[p1_avg['type'] == type_name][metric].iloc[0]
             p2_type_avg = p2_avg[p2_avg['type'] == type_name][metric].iloc[0]
             pct_change = ((p2_type_avg - p1_type_avg) / p1_type_avg) * 100
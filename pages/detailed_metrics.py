@@ -2,21 +2,26 @@
 import dash
 from dash import html, dcc, callback, Input, Output
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from lazy_imports import lazy_module
+subplots = lazy_module('plotly.subplots')
 import dash_bootstrap_components as dbc
 from data_store import data_store
+from parallel_aggregation import parallel_aggregate
+from components.graphs import scatter_trace
+from components.figure_encoding import binary_figures
 import pandas as pd
 
 dash.register_page(__name__, path='/detailed-metrics', name='Detailed Metrics')
 
-def create_detailed_analysis(df):
+def create_detailed_analysis(start_date, end_date, section=None):
     # Per-type metrics
-    type_metrics = df.groupby('type').agg({
-        'clicks': 'sum',
-        'impressions': 'sum',
-        'ctr': 'mean',
-        'page': 'nunique'
-    }).reset_index()
+    type_metrics = parallel_aggregate(
+        start_date, end_date, by=['type'], section=section,
+        clicks=('clicks', 'sum'),
+        impressions=('impressions', 'sum'),
+        ctr=('ctr', 'mean'),
+        page=('page_id', 'nunique')
+    )
 
     # Calculate per-page metrics
     type_metrics['clicks_per_page'] = type_metrics['clicks'] / type_metrics['page']
@@ -24,14 +29,15 @@ def create_detailed_analysis(df):
     type_metrics['ctr_per_page'] = type_metrics['ctr']
 
     # Time-based metrics
-    time_metrics = df.groupby(['date', 'type']).agg({
-        'clicks': 'sum',
-        'impressions': 'sum',
-        'ctr': 'mean'
-    }).reset_index()
+    time_metrics = parallel_aggregate(
+        start_date, end_date, by=['date', 'type'], section=section,
+        clicks=('clicks', 'sum'),
+        impressions=('impressions', 'sum'),
+        ctr=('ctr', 'mean')
+    )
 
     # Create subplots
-    fig = make_subplots(
+    fig = subplots.make_subplots(
         rows=6, 
         cols=1,
         subplot_titles=(
@@ -75,10 +81,11 @@ def create_detailed_analysis(df):
 
     # Add time series traces
     # 4. Clicks over time
-    for type_name in df['type'].unique():
+    for type_name in type_metrics['type']:
         type_data = time_metrics[time_metrics['type'] == type_name]
+        trace = scatter_trace(len(type_data))
         fig.add_trace(
-            go.Scatter(x=type_data['date'], 
+            trace(x=type_data['date'], 
                       y=type_data['clicks'],
                       name=f'{type_name} Clicks',
                       mode='lines',
@@ -87,10 +94,11 @@ def create_detailed_analysis(df):
         )
 
     # 5. Impressions over time
-    for type_name in df['type'].unique():
+    for type_name in type_metrics['type']:
         type_data = time_metrics[time_metrics['type'] == type_name]
+        trace = scatter_trace(len(type_data))
         fig.add_trace(
-            go.Scatter(x=type_data['date'], 
+            trace(x=type_data['date'], 
                       y=type_data['impressions'],
                       name=f'{type_name} Impressions',
                       mode='lines',
@@ -99,10 +107,11 @@ def create_detailed_analysis(df):
         )
 
     # 6. CTR over time
-    for type_name in df['type'].unique():
+    for type_name in type_metrics['type']:
         type_data = time_metrics[time_metrics['type'] == type_name]
+        trace = scatter_trace(len(type_data))
         fig.add_trace(
-            go.Scatter(x=type_data['date'], 
+            trace(x=type_data['date'], 
                       y=type_data['ctr'],
                       name=f'{type_name} CTR',
                       mode='lines',
@@ -156,10 +165,10 @@ layout = html.Div([
                 html.Label("Select Date Range:"),
                 dcc.DatePickerRange(
                     id='detailed-date-range',
-                    min_date_allowed=data_store.df['date'].min(),
-                    max_date_allowed=data_store.df['date'].max(),
-                    start_date=data_store.df['date'].min(),
-                    end_date=data_store.df['date'].max(),
+                    min_date_allowed=data_store.min_date,
+                    max_date_allowed=data_store.max_date,
+                    start_date=data_store.min_date,
+                    end_date=data_store.max_date,
                     className="mb-3"
                 )
             ])
@@ -195,17 +204,13 @@ layout = html.Div([
     [Output('detailed-metrics-graph', 'figure'),
      Output('summary-statistics', 'children')],
     [Input('detailed-date-range', 'start_date'),
-     Input('detailed-date-range', 'end_date')]
+     Input('detailed-date-range', 'end_date'),
+     Input('section-filter', 'value')]
 )
-def update_detailed_metrics(start_date, end_date):
-    df = data_store.df
-    
-    # Filter data based on date range
-    mask = (df['date'] >= start_date) & (df['date'] <= end_date)
-    filtered_df = df[mask]
-    
-    # Create analysis
-    fig, type_metrics, time_metrics = create_detailed_analysis(filtered_df)
+@binary_figures
+def update_detailed_metrics(start_date, end_date, section):
+    # Create analysis for the date range and site section
+    fig, type_metrics, time_metrics = create_detailed_analysis(start_date, end_date, section)
     
     # Create summary tables
     summary_tables = html.Div([
@@ -241,7 +246,7 @@ def export_detailed_analysis(n_clicks):
     if n_clicks:
         # Create PDF report (you'll need to implement this)
         return dcc.send_data_frame(
-            data_store.df.to_excel,
+            data_store.backend.rows().to_excel,
             "detailed_analysis.xlsx",
             sheet_name="Analysis"
         )
\ No newline at end of file
@@ -1,11 +1,15 @@
 # pages/overview.py
 import dash
 from dash import html, dcc, callback, Input, Output
-import plotly.express as px
+from lazy_imports import lazy_module
+px = lazy_module('plotly.express')
 import plotly.graph_objects as go
 import dash_bootstrap_components as dbc
 from data_processor import calculate_metrics, COLORS
+from components.graphs import create_box_plot, create_box_plot_from_statistics
+from components.figure_encoding import binary_figures
 from data_store import data_store
+from parallel_aggregation import use_parallel, parallel_box_statistics
 
 
 dash.register_page(__name__, path='/', name='Overview')
@@ -31,10 +35,10 @@ layout = html.Div([
                     html.Label("Select Date Range:"),
                     dcc.DatePickerRange(
                         id='overview-date-range',
-                        min_date_allowed=data_store.df['date'].min(),
-                        max_date_allowed=data_store.df['date'].max(),
-                        start_date=data_store.df['date'].min(),
-                        end_date=data_store.df['date'].max(),
+                        min_date_allowed=data_store.min_date,
+                        max_date_allowed=data_store.max_date,
+                        start_date=data_store.min_date,
+                        end_date=data_store.max_date,
                         className="mb-3"
                     )
                 ], className="date-picker-container")
@@ -76,17 +80,15 @@ layout = html.Div([
      Output('type-performance', 'figure'),
      Output('ctr-distribution', 'figure')],
     [Input('overview-date-range', 'start_date'),
-     Input('overview-date-range', 'end_date')]
+     Input('overview-date-range', 'end_date'),
+     Input('section-filter', 'value')]
 )
-def update_overview(start_date, end_date):
-    df = data_store.df
-    
-    # Filter data based on date range
-    mask = (df['date'] >= start_date) & (df['date'] <= end_date)
-    filtered_df = df[mask]
+@binary_figures
+def update_overview(start_date, end_date, section):
+    backend = data_store.backend
     
     # Calculate metrics
-    metrics = calculate_metrics(filtered_df)
+    metrics = calculate_metrics(start_date, end_date, section)
     
     # Create metric cards
     cards = dbc.Row([
@@ -98,10 +100,11 @@ def update_overview(start_date, end_date):
     
     # Create performance by type figure
     type_perf = px.bar(
-        filtered_df.groupby('type').agg({
-            'clicks': 'sum',
-            'impressions': 'sum'
-        }).reset_index(),
+        backend.aggregate(
+            start_date, end_date, by=['type'], section=section,
+            clicks=('clicks', 'sum'),
+            impressions=('impressions', 'sum')
+        ),
         x='type',
         y=['clicks', 'impressions'],
         barmode='group',
@@ -109,15 +112,21 @@ def update_overview(start_date, end_date):
         color_discrete_sequence=[COLORS[0], COLORS[4]]
     )
     
-    # Create CTR distribution figure
-    ctr_dist = px.box(
-        filtered_df,
-        x='type',
-        y='ctr',
-        color='type',
-        title='CTR Distribution by Content Type',
-        color_discrete_sequence=COLORS
-    )
+    # Create CTR distribution figure (large ranges are summarised across the worker pool)
+    if use_parallel(start_date, end_date, section):
+        ctr_dist = create_box_plot_from_statistics(
+            parallel_box_statistics(start_date, end_date, 'type', 'ctr', section),
+            x='type',
+            y='ctr',
+            title='CTR Distribution by Content Type'
+        )
+    else:
+        ctr_dist = create_box_plot(
+            backend.rows(start_date, end_date, ['type', 'ctr'], section),
+            x='type',
+            y='ctr',
+            title='CTR Distribution by Content Type'
+        )
     
     return cards, type_perf, ctr_dist
 
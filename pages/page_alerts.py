@@ -0,0 +1,131 @@
+# pages/page_alerts.py
+import dash
+from dash import html, dcc, dash_table, callback, Input, Output
+from dash.dash_table.Format import Format, Scheme, Sign
+import dash_bootstrap_components as dbc
+import pandas as pd
+from anomaly_detection import scan_pages, BASELINE_DAYS, MAX_RANGE_DAYS
+from data_processor import top_k
+from data_store import data_store
+
+dash.register_page(__name__, path='/page-alerts', name='Page Alerts')
+
+MAX_MOVERS = 50
+
+FIXED_2 = Format(precision=2, scheme=Scheme.fixed)
+
+TABLE_COLUMNS = [
+    {'name': 'Page', 'id': 'page'},
+    {'name': 'Type', 'id': 'type'},
+    {'name': 'Baseline / Day', 'id': 'baseline', 'type': 'numeric', 'format': FIXED_2},
+    {'name': 'Recent / Day', 'id': 'recent', 'type': 'numeric', 'format': FIXED_2},
+    {'name': 'Change %', 'id': 'change_pct', 'type': 'numeric',
+     'format': Format(precision=1, scheme=Scheme.fixed, sign=Sign.positive)},
+    {'name': 'Z-Score', 'id': 'z_score', 'type': 'numeric',
+     'format': Format(precision=2, scheme=Scheme.fixed, sign=Sign.positive)},
+    {'name': 'Slope / Day', 'id': 'slope', 'type': 'numeric',
+     'format': Format(precision=2, scheme=Scheme.fixed, sign=Sign.positive)}
+]
+
+layout = html.Div([
+    html.H1("Page Alerts",
+            className="text-center mb-4"),
+
+    dbc.Container([
+        # Controls
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select Date Range:"),
+                dcc.DatePickerRange(
+                    id='alerts-date-range',
+                    min_date_allowed=data_store.min_date + pd.Timedelta(days=BASELINE_DAYS),
+                    max_date_allowed=data_store.max_date,
+                    start_date=data_store.max_date - pd.Timedelta(days=6),
+                    end_date=data_store.max_date,
+                    className="mb-3"
+                )
+            ], width=4),
+
+            dbc.Col([
+                html.Label("Select Metric:"),
+                dcc.Dropdown(
+                    id='alerts-metric',
+                    options=[
+                        {'label': 'Clicks', 'value': 'clicks'},
+                        {'label': 'Impressions', 'value': 'impressions'}
+                    ],
+                    value='clicks',
+                    clearable=False,
+                    className="mb-3"
+                )
+            ], width=4),
+
+            dbc.Col([
+                html.Label("Show:"),
+                dcc.RadioItems(
+                    id='alerts-direction',
+                    options=[
+                        {'label': ' Drops', 'value': 'drops'},
+                        {'label': ' Gains', 'value': 'gains'},
+                        {'label': ' Both', 'value': 'both'}
+                    ],
+                    value='drops',
+                    inline=True,
+                    className="mb-3"
+                )
+            ], width=4)
+        ]),
+
+        # Biggest Movers
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.H3("Biggest Movers"),
+                    html.P(f"Scored against each page's trailing {BASELINE_DAYS}-day baseline.",
+                           className="text-muted"),
+                    html.P(id='alerts-range-note', className="text-muted"),
+                    dash_table.DataTable(
+                        id='alerts-table',
+                        columns=TABLE_COLUMNS,
+                        page_size=25,
+                        style_cell={'textAlign': 'left', 'maxWidth': '480px',
+                                    'overflow': 'hidden', 'textOverflow': 'ellipsis'},
+                        style_header={'fontWeight': 'bold'}
+                    )
+                ], className="graph-container")
+            ], width=12)
+        ])
+    ])
+])
+
+@callback(
+    [Output('alerts-table', 'data'),
+     Output('alerts-range-note', 'children')],
+    [Input('alerts-date-range', 'start_date'),
+     Input('alerts-date-range', 'end_date'),
+     Input('alerts-metric', 'value'),
+     Input('alerts-direction', 'value'),
+     Input('section-filter', 'value')]
+)
+def update_page_alerts(start_date, end_date, metric, direction, section):
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    if start > end:
+        return [], None
+
+    # Long ranges are cut to the most recent MAX_RANGE_DAYS to bound the scan
+    note = None
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        start = end - pd.Timedelta(days=MAX_RANGE_DAYS - 1)
+        note = f"Ranges are limited to {MAX_RANGE_DAYS} days; showing {start:%Y-%m-%d} to {end:%Y-%m-%d}."
+
+    results = scan_pages(start, end, metric, section)
+
+    if direction == 'drops':
+        movers = top_k(results, 'z_score', MAX_MOVERS, ascending=True)
+    elif direction == 'gains':
+        movers = top_k(results, 'z_score', MAX_MOVERS)
+    else:
+        results['abs_z'] = results['z_score'].abs()
+        movers = top_k(results, 'abs_z', MAX_MOVERS)
+
+    return movers[[c['id'] for c in TABLE_COLUMNS]].to_dict('records'), note
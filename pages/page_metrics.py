@@ -1,2 +1,159 @@
 # pages/page_metrics.py
-# Similar structure for page metrics analysis
\ No newline at end of file
+import math
+import dash
+from dash import html, dcc, dash_table, callback, Input, Output
+from dash.dash_table import FormatTemplate
+from dash.dash_table.Format import Format, Scheme
+import dash_bootstrap_components as dbc
+import pandas as pd
+from data_processor import top_k
+from data_store import data_store
+
+dash.register_page(__name__, path='/page-metrics', name='Page Metrics')
+
+PAGE_SIZE = 25
+
+TABLE_COLUMNS = [
+    {'name': 'Page', 'id': 'page'},
+    {'name': 'Type', 'id': 'type'},
+    {'name': 'Clicks', 'id': 'clicks', 'type': 'numeric'},
+    {'name': 'Impressions', 'id': 'impressions', 'type': 'numeric'},
+    {'name': 'CTR', 'id': 'ctr', 'type': 'numeric',
+     'format': FormatTemplate.percentage(2)},
+    {'name': 'Average Position', 'id': 'position', 'type': 'numeric',
+     'format': Format(precision=2, scheme=Scheme.fixed)}
+]
+
+FILTER_OPERATORS = [
+    ['ge ', '>='],
+    ['le ', '<='],
+    ['lt ', '<'],
+    ['gt ', '>'],
+    ['ne ', '!='],
+    ['eq ', '='],
+    ['contains '],
+    ['datestartswith ']
+]
+
+def split_filter_part(filter_part):
+    """Split one DataTable filter expression into (column, operator, value)"""
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+
+                value_part = value_part.strip()
+                v0 = value_part[0] if value_part else ''
+                if v0 == value_part[-1:] and v0 in ("'", '"', '`'):
+                    value = value_part[1: -1].replace('\\' + v0, v0)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+
+                return name, operator_type[0].strip(), value
+
+    return None, None, None
+
+def apply_filter_query(df, filter_query):
+    """Apply a DataTable filter_query to the per-page totals"""
+    if not filter_query:
+        return df
+
+    for filter_part in filter_query.split(' && '):
+        col_name, operator, filter_value = split_filter_part(filter_part)
+        if col_name not in df.columns:
+            continue
+
+        if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+            if pd.api.types.is_numeric_dtype(df[col_name]):
+                # Text typed into a numeric column's filter can't match anything sensibly
+                if isinstance(filter_value, str):
+                    continue
+            elif not isinstance(filter_value, str):
+                filter_value = format(filter_value, 'g')
+            df = df.loc[getattr(df[col_name], operator)(filter_value)]
+        elif operator == 'contains':
+            df = df.loc[df[col_name].astype(str).str.contains(str(filter_value), regex=False)]
+        elif operator == 'datestartswith':
+            df = df.loc[df[col_name].astype(str).str.startswith(str(filter_value))]
+
+    return df
+
+layout = html.Div([
+    html.H1("Page Metrics Explorer",
+            className="text-center mb-4"),
+
+    dbc.Container([
+        # Date Range Selector
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.Label("Select Date Range:"),
+                    dcc.DatePickerRange(
+                        id='page-metrics-date-range',
+                        min_date_allowed=data_store.min_date,
+                        max_date_allowed=data_store.max_date,
+                        start_date=data_store.min_date,
+                        end_date=data_store.max_date,
+                        className="mb-3"
+                    )
+                ], className="date-picker-container")
+            ])
+        ]),
+
+        # Top Pages Table
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.H3("Top Pages"),
+                    dash_table.DataTable(
+                        id='page-metrics-table',
+                        columns=TABLE_COLUMNS,
+                        page_current=0,
+                        page_size=PAGE_SIZE,
+                        page_action='custom',
+                        sort_action='custom',
+                        sort_mode='single',
+                        sort_by=[{'column_id': 'clicks', 'direction': 'desc'}],
+                        filter_action='custom',
+                        filter_query='',
+                        style_cell={'textAlign': 'left', 'maxWidth': '480px',
+                                    'overflow': 'hidden', 'textOverflow': 'ellipsis'},
+                        style_header={'fontWeight': 'bold'}
+                    )
+                ], className="graph-container")
+            ], width=12)
+        ])
+    ])
+])
+
+@callback(
+    [Output('page-metrics-table', 'data'),
+     Output('page-metrics-table', 'page_count')],
+    [Input('page-metrics-date-range', 'start_date'),
+     Input('page-metrics-date-range', 'end_date'),
+     Input('page-metrics-table', 'page_current'),
+     Input('page-metrics-table', 'page_size'),
+     Input('page-metrics-table', 'sort_by'),
+     Input('page-metrics-table', 'filter_query'),
+     Input('section-filter', 'value')]
+)
+def update_page_metrics(start_date, end_date, page_current, page_size, sort_by, filter_query, section):
+    totals = apply_filter_query(data_store.backend.page_totals(start_date, end_date, section), filter_query)
+
+    if sort_by:
+        column = sort_by[0]['column_id']
+        ascending = sort_by[0]['direction'] == 'asc'
+    else:
+        column, ascending = 'clicks', False
+
+    # Only rank as many rows as are needed to fill the requested page
+    first_row = page_current * page_size
+    ranked = top_k(totals, column, first_row + page_size, ascending=ascending)
+    visible = ranked.iloc[first_row:first_row + page_size]
+
+    page_count = max(math.ceil(len(totals) / page_size), 1)
+    return visible[[c['id'] for c in TABLE_COLUMNS]].to_dict('records'), page_count
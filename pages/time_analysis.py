@@ -1,12 +1,16 @@
 # pages/time_analysis.py
 import dash
 from dash import html, dcc, callback, Input, Output
-import plotly.express as px
+from lazy_imports import lazy_module
+px = lazy_module('plotly.express')
 import plotly.graph_objects as go
 import dash_bootstrap_components as dbc
 from data_processor import get_time_series_data, COLORS
 
 from data_store import data_store
+from query_backend import WEEKDAYS
+from components.figure_encoding import binary_figures
+from windowed_analytics import rolling, period_over_period, cumulative, per_period
 
 
 
@@ -51,8 +55,19 @@ layout = html.Div([
                 html.Label("Show Moving Average:"),
                 dcc.Checklist(
                     id='show-ma',
-                    options=[{'label': ' 7-day Moving Average', 'value': 'yes'}],
+                    options=[{'label': ' Moving Average', 'value': 'yes'}],
                     value=[],
+                    className="mb-1"
+                ),
+                dcc.Dropdown(
+                    id='ma-window',
+                    options=[
+                        {'label': '7 days', 'value': 7},
+                        {'label': '28 days', 'value': 28},
+                        {'label': '90 days', 'value': 90}
+                    ],
+                    value=7,
+                    clearable=False,
                     className="mb-3"
                 )
             ], width=4)
@@ -67,6 +82,27 @@ layout = html.Div([
             ], width=12)
         ]),
 
+        # Period-over-Period Graph
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    html.H3("Period-over-Period"),
+                    dcc.Dropdown(
+                        id='trend-view',
+                        options=[
+                            {'label': 'Week over week (7-day totals)', 'value': 'wow'},
+                            {'label': 'Year over year (7-day totals)', 'value': 'yoy'},
+                            {'label': 'Cumulative total', 'value': 'cumulative'}
+                        ],
+                        value='wow',
+                        clearable=False,
+                        className="mb-3"
+                    ),
+                    dcc.Graph(id='trend-plot')
+                ], className="graph-container")
+            ], width=12)
+        ]),
+
         # Additional Analysis
         dbc.Row([
             dbc.Col([
@@ -92,13 +128,16 @@ layout = html.Div([
      Output('monthly-trends', 'figure')],
     [Input('metric-selector', 'value'),
      Input('time-aggregation', 'value'),
-     Input('show-ma', 'value')]
+     Input('show-ma', 'value'),
+     Input('ma-window', 'value'),
+     Input('section-filter', 'value')]
 )
-def update_time_analysis(metric, aggregation, show_ma):
-    df = data_store.df
+@binary_figures
+def update_time_analysis(metric, aggregation, show_ma, ma_window, section):
+    backend = data_store.backend
     
     # Time series plot
-    time_data = get_time_series_data(df, metric, aggregation)
+    time_data = get_time_series_data(metric, aggregation, section)
     
     fig_time = px.line(
         time_data,
@@ -110,23 +149,22 @@ def update_time_analysis(metric, aggregation, show_ma):
     )
     
     if show_ma and 'yes' in show_ma:
-        # Add moving average
-        for type_name in df['type'].unique():
-            type_data = time_data[time_data['type'] == type_name]
-            ma = type_data[metric].rolling(window=7).mean()
+        # Calendar-window moving average of the daily series, scaled to the aggregation period
+        ma_window = ma_window or 7
+        ma = per_period(rolling(ma_window, 'mean', section)[metric], aggregation)
+        for type_name in time_data['type'].unique():
             fig_time.add_scatter(
-                x=type_data['date'],
-                y=ma,
-                name=f'{type_name} (7-day MA)',
+                x=ma.index,
+                y=ma[type_name],
+                name=f'{type_name} ({ma_window}-day MA)',
                 line=dict(dash='dash'),
                 showlegend=True
             )
     
     # Weekday analysis
-    df['weekday'] = df['date'].dt.day_name()
-    weekday_data = df.groupby('weekday')[metric].mean().reindex([
-        'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
-    ])
+    weekday_data = backend.aggregate(
+        by=['weekday'], section=section, **{metric: (metric, 'mean')}
+    ).set_index('weekday')[metric].reindex(WEEKDAYS)
     
     fig_weekday = px.bar(
         weekday_data,
@@ -135,8 +173,9 @@ def update_time_analysis(metric, aggregation, show_ma):
     )
     
     # Monthly trends
-    df['month'] = df['date'].dt.strftime('%Y-%m')
-    monthly_data = df.groupby(['month', 'type'])[metric].mean().reset_index()
+    monthly_data = backend.aggregate(
+        by=['year_month', 'type'], section=section, **{metric: (metric, 'mean')}
+    ).rename(columns={'year_month': 'month'})
     
     fig_monthly = px.line(
         monthly_data,
@@ -147,4 +186,41 @@ def update_time_analysis(metric, aggregation, show_ma):
         color_discrete_sequence=COLORS
     )
     
-    return fig_time, fig_weekday, fig_monthly
\ No newline at end of file
+    return fig_time, fig_weekday, fig_monthly
+
+@callback(
+    Output('trend-plot', 'figure'),
+    [Input('metric-selector', 'value'),
+     Input('trend-view', 'value'),
+     Input('section-filter', 'value')]
+)
+@binary_figures
+def update_trend_view(metric, view, section):
+    if view == 'cumulative':
+        trend = cumulative(section)[metric]
+        title = f'Cumulative {metric.capitalize()}'
+        y_title = metric.capitalize()
+    else:
+        period, lag_days = ('Week', 7) if view == 'wow' else ('Year', 364)
+        trend = period_over_period(lag_days, section=section)['change_pct'][metric]
+        title = f'{metric.capitalize()} {period} over {period} (7-day totals)'
+        y_title = 'Change %'
+
+    fig = go.Figure()
+    for i, type_name in enumerate(trend.columns):
+        fig.add_trace(go.Scatter(
+            x=trend.index,
+            y=trend[type_name],
+            name=type_name,
+            mode='lines',
+            line=dict(color=COLORS[i % len(COLORS)])
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title='Date',
+        yaxis_title=y_title,
+        hovermode='x unified'
+    )
+
+    return fig
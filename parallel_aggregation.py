@@ -0,0 +1,260 @@
+# parallel_aggregation.py
+"""Fan heavy aggregations over large date ranges out to a process pool.
+
+The range is split into contiguous day chunks. Each worker process computes
+partial states for its chunk with the regular backend (sums, counts, min/max,
+the distinct keys behind nunique and fixed-bin histograms for quantiles), and
+the partials are merged here. Workers are forked, so they share the loaded
+data copy-on-write instead of receiving it. Queries below PARALLEL_MIN_ROWS
+run on the calling thread as before.
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pandas as pd
+from data_store import data_store
+from query_backend import GROUP_KEYS
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_WORKERS = int(os.environ.get('DASHBOARD_PARALLEL_WORKERS', os.cpu_count() or 1))
+PARALLEL_MIN_ROWS = int(os.environ.get('DASHBOARD_PARALLEL_MIN_ROWS', 2_000_000))
+HISTOGRAM_BINS = 2048
+
+# How each requested aggregation is rebuilt from the partial columns
+MERGEABLE_AGGS = ('sum', 'count', 'mean', 'min', 'max', 'nunique')
+MERGE_FUNCS = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+# Process whose pool broke; it stays serial rather than re-forking from a threaded worker
+_broken_pid = None
+
+def use_parallel(start_date=None, end_date=None, section=None):
+    """Whether a query over this range is large enough to split across processes"""
+    if PARALLEL_WORKERS <= 1 or _broken_pid == os.getpid():
+        return False
+    return data_store.backend.count_rows(start_date, end_date, section) >= PARALLEL_MIN_ROWS
+
+def start_pool():
+    """Fork the worker processes now if the loaded data can ever reach the threshold.
+
+    Called from gunicorn's post_fork hook, while the worker is still single
+    threaded; otherwise the pool is started on first use.
+    """
+    if PARALLEL_WORKERS > 1 and data_store.backend.count_rows() >= PARALLEL_MIN_ROWS:
+        get_pool()
+
+def get_pool():
+    """Return the process pool for the current process and dataset version"""
+    global _pool, _pool_key
+    key = (os.getpid(), data_store.version)
+    with _pool_lock:
+        if _pool_key != key:
+            if _pool is not None and _pool_key is not None and _pool_key[0] == key[0]:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(
+                PARALLEL_WORKERS,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker
+            )
+            _pool_key = key
+            # A fork-context pool starts all of its workers on the first submit
+            _pool.submit(os.getpid).result()
+        return _pool
+
+def _init_worker():
+    # Leave shutdown to the pool rather than the signal handlers of the parent
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def date_chunks(start_date=None, end_date=None, parts=PARALLEL_WORKERS):
+    """Split an inclusive date range into up to `parts` contiguous day ranges"""
+    start = pd.Timestamp(start_date if start_date is not None else data_store.min_date).normalize()
+    end = pd.Timestamp(end_date if end_date is not None else data_store.max_date).normalize()
+    days = pd.date_range(max(start, data_store.min_date), min(end, data_store.max_date), freq='D')
+    splits = np.array_split(np.arange(len(days)), max(1, min(parts, len(days))))
+    return [(days[split[0]], days[split[-1]]) for split in splits if len(split)]
+
+def _map_chunks(func, start_date, end_date, *args):
+    chunks = date_chunks(start_date, end_date)
+    pool = get_pool()
+    futures = [pool.submit(func, data_store.version, chunk_start, chunk_end, *args)
+               for chunk_start, chunk_end in chunks]
+    return [future.result() for future in futures]
+
+def _run(parallel, serial):
+    """Run the parallel plan, falling back to serial if the pool has died.
+
+    A broken pool is not replaced: this process is already serving requests on
+    several threads, which is no state to fork from, so it stays serial.
+    """
+    global _pool, _pool_key, _broken_pid
+    try:
+        return parallel()
+    except BrokenProcessPool:
+        logger.warning("Aggregation worker pool broke; running queries serially in this process")
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+            _pool_key = None
+            _broken_pid = os.getpid()
+        return serial()
+
+def parallel_aggregate(start_date=None, end_date=None, by=(), section=None, **aggs):
+    """Drop-in for backend.aggregate that splits large queries across the pool.
+
+    Supports sum, count, mean, min, max and nunique (of a group key); other
+    aggregations and small queries run on the backend directly.
+    """
+    backend = data_store.backend
+    mergeable = all(
+        func in MERGEABLE_AGGS and (func != 'nunique' or column in GROUP_KEYS)
+        for column, func in aggs.values()
+    )
+
+    def serial():
+        return backend.aggregate(start_date, end_date, by=by, section=section, **aggs)
+
+    def parallel():
+        partials = _map_chunks(_aggregate_chunk, start_date, end_date, tuple(by), section, aggs)
+        return _merge_aggregates(partials, list(by), aggs)
+
+    if not mergeable or not use_parallel(start_date, end_date, section):
+        return serial()
+    return _run(parallel, serial)
+
+def _partial_aggs(aggs):
+    partial = {}
+    for name, (column, func) in aggs.items():
+        if func == 'mean':
+            partial[f'{name}__sum'] = (column, 'sum')
+            partial[f'{name}__count'] = (column, 'count')
+        elif func != 'nunique':
+            partial[name] = (column, func)
+    return partial
+
+def _aggregate_chunk(version, start_date, end_date, by, section, aggs):
+    if version != data_store.version:
+        raise RuntimeError("Aggregation worker holds a different dataset version")
+    backend = data_store.backend
+    partial = _partial_aggs(aggs)
+    totals = backend.aggregate(start_date, end_date, by=list(by), section=section, **partial) if partial else None
+    # The distinct (group, value) keys behind each nunique merge by union
+    distinct = {
+        name: backend.aggregate(start_date, end_date, by=[*by, column], section=section,
+                                rows=(column, 'count'))[[*by, column]]
+        for name, (column, func) in aggs.items() if func == 'nunique'
+    }
+    return totals, distinct
+
+def _merge_aggregates(partials, by, aggs):
+    partial_aggs = _partial_aggs(aggs)
+    if partial_aggs:
+        totals = pd.concat([totals for totals, _ in partials], ignore_index=True)
+        merge = {name: MERGE_FUNCS.get(func, 'sum') for name, (_, func) in partial_aggs.items()}
+        if by:
+            merged = totals.groupby(by).agg(merge)
+        else:
+            merged = pd.DataFrame({name: [totals[name].agg(func)] for name, func in merge.items()})
+    else:
+        merged = None
+
+    columns = {}
+    for name, (column, func) in aggs.items():
+        if func == 'mean':
+            count = merged[f'{name}__count']
+            columns[name] = merged[f'{name}__sum'] / count.where(count > 0)
+        elif func == 'nunique':
+            distinct = pd.concat([chunk[name] for _, chunk in partials], ignore_index=True).drop_duplicates()
+            columns[name] = distinct.groupby(by).size() if by else pd.Series([len(distinct)])
+        else:
+            columns[name] = merged[name]
+
+    if not by:
+        return pd.DataFrame({name: [values.iloc[0]] for name, values in columns.items()})
+    result = pd.DataFrame(columns)
+    # nunique has no entry for groups whose rows all lacked the column
+    for name, (_, func) in aggs.items():
+        if func == 'nunique':
+            result[name] = result[name].fillna(0).astype(int)
+    return result.reset_index()
+
+def parallel_box_statistics(start_date, end_date, x, y, section=None):
+    """Per-group box statistics of column y, computed across the pool.
+
+    Quartiles and fences are read from merged fixed-bin histograms spanning
+    each group's exact min and max, so they are accurate to 1/HISTOGRAM_BINS
+    of that range. Returns the frame produced by components.graphs.box_statistics.
+    """
+    bounds = parallel_aggregate(
+        start_date, end_date, by=[x], section=section,
+        count=(y, 'count'), mean=(y, 'mean'), low=(y, 'min'), high=(y, 'max')
+    ).set_index(x)
+    bounds = bounds[bounds['count'] > 0]
+    ranges = dict(zip(bounds.index, zip(bounds['low'], bounds['high'])))
+
+    def histograms():
+        merged = {}
+        for chunk in _map_chunks(_histogram_chunk, start_date, end_date, x, y, section, ranges):
+            for name, counts in chunk.items():
+                merged[name] = merged[name] + counts if name in merged else counts
+        return merged
+
+    def serial():
+        return _histogram_chunk(data_store.version, start_date, end_date, x, y, section, ranges)
+
+    merged = _run(histograms, serial) if use_parallel(start_date, end_date, section) else serial()
+
+    stats = []
+    for name, row in bounds.iterrows():
+        edges = np.linspace(row['low'], row['high'], HISTOGRAM_BINS + 1)
+        counts = merged[name]
+        q1, median, q3 = _histogram_quantiles(counts, edges, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        occupied = np.flatnonzero(counts)
+        lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        first = occupied[edges[occupied + 1] >= lower][0]
+        last = occupied[edges[occupied] <= upper][-1]
+        stats.append({
+            x: name,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': max(edges[first], lower, row['low']),
+            'upperfence': min(edges[last + 1], upper, row['high']),
+            'mean': row['mean'],
+            'count': int(row['count'])
+        })
+    return pd.DataFrame(stats, columns=[x, 'q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'count'])
+
+def _histogram_chunk(version, start_date, end_date, x, y, section, ranges):
+    if version != data_store.version:
+        raise RuntimeError("Aggregation worker holds a different dataset version")
+    rows = data_store.backend.rows(start_date, end_date, [x, y], section).dropna(subset=[y])
+    histograms = {name: np.zeros(HISTOGRAM_BINS, dtype=np.int64) for name in ranges}
+    for name, values in rows.groupby(x)[y]:
+        if name not in ranges:
+            continue
+        low, high = ranges[name]
+        if low == high:
+            histograms[name][0] += len(values)
+        else:
+            histograms[name] += np.histogram(values.to_numpy(), bins=HISTOGRAM_BINS, range=(low, high))[0]
+    return histograms
+
+def _histogram_quantiles(counts, edges, quantiles):
+    """Interpolate quantiles linearly within the histogram bin that holds them"""
+    cumulative = np.cumsum(counts)
+    targets = np.asarray(quantiles) * cumulative[-1]
+    bins = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(counts) - 1)
+    before = cumulative[bins] - counts[bins]
+    fraction = np.divide(targets - before, counts[bins], out=np.zeros(len(bins)), where=counts[bins] > 0)
+    return edges[bins] + fraction * (edges[bins + 1] - edges[bins])
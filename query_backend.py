@@ -0,0 +1,381 @@
+# query_backend.py
+import os
+import sqlite3
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+
+AGGREGATE_FREQ = 'M'
+SECTION_CACHE_SIZE = 16
+CSV_CHUNK_SIZE = 500_000
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Group keys understood by every backend. 'week' and 'month' are labelled with
+# the period end date, matching pd.Grouper(freq='W') and pd.Grouper(freq='M').
+GROUP_KEYS = ('date', 'week', 'month', 'weekday', 'year_month', 'type', 'page_id')
+TIME_KEYS = {'D': 'date', 'W': 'week', 'M': 'month'}
+
+ROW_COLUMNS = ['date', 'page', 'type', 'clicks', 'impressions', 'ctr', 'position']
+
+# Live SQLiteBackend instances, so their connections can be dropped after a fork
+_sqlite_backends = weakref.WeakSet()
+
+class QueryBackend:
+    """Query interface shared by all storage backends.
+
+    Every dashboard aggregation goes through aggregate(), rows() or
+    page_totals(). Page-level metadata (ids, types and the path index) lives
+    on the owning DataStore so backends only differ in how rows are stored.
+    """
+    name = None
+
+    def __init__(self, store):
+        self.store = store
+
+    def aggregate(self, start_date=None, end_date=None, by=(), section=None, **aggs):
+        """Group the rows in a date range by keys from GROUP_KEYS.
+
+        Aggregations use pandas named-aggregation syntax, e.g.
+        clicks=('clicks', 'sum'), pages=('page_id', 'nunique').
+        """
+        raise NotImplementedError
+
+    def rows(self, start_date=None, end_date=None, columns=ROW_COLUMNS, section=None):
+        """Return raw rows in a date range"""
+        raise NotImplementedError
+
+    def count_rows(self, start_date=None, end_date=None, section=None):
+        """Number of rows in a date range"""
+        counts = self.aggregate(start_date, end_date, section=section, rows=('date', 'count'))
+        return int(counts['rows'].iloc[0])
+
+    def period_page_totals(self, first_period, last_period, section=None):
+        """Per-page partial totals read from the pre-aggregated period table"""
+        raise NotImplementedError
+
+    def page_totals(self, start_date, end_date, section=None):
+        """Per-page totals for a date range.
+
+        Periods fully inside the range are read from the pre-aggregated table;
+        only the partial periods at either edge are aggregated from raw rows.
+        """
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        first_full = start.to_period(AGGREGATE_FREQ)
+        if first_full.start_time != start:
+            first_full += 1
+        last_full = end.to_period(AGGREGATE_FREQ)
+        if last_full.end_time.normalize() != end:
+            last_full -= 1
+
+        partial_aggs = dict(
+            clicks=('clicks', 'sum'),
+            impressions=('impressions', 'sum'),
+            position_sum=('position', 'sum'),
+            rows=('position', 'count')
+        )
+        if first_full <= last_full:
+            parts = [
+                self.period_page_totals(first_full, last_full, section),
+                self.aggregate(start, first_full.start_time - pd.Timedelta(days=1),
+                               by=['page_id'], section=section, **partial_aggs),
+                self.aggregate(last_full.end_time.normalize() + pd.Timedelta(days=1), end,
+                               by=['page_id'], section=section, **partial_aggs)
+            ]
+        else:
+            parts = [self.aggregate(start, end, by=['page_id'], section=section, **partial_aggs)]
+
+        totals = pd.concat(parts).groupby('page_id').sum()
+        totals['page'] = self.store.pages[totals.index]
+        totals['type'] = self.store.page_types.reindex(totals.index).values
+        totals['ctr'] = totals['clicks'] / totals['impressions']
+        totals['position'] = totals['position_sum'] / totals['rows']
+        return totals.drop(columns=['position_sum', 'rows']).reset_index()
+
+class PandasBackend(QueryBackend):
+    """Keep every row in memory in a date-ordered DataFrame"""
+    name = 'pandas'
+
+    def __init__(self, store, df):
+        super().__init__(store)
+        self.df = df
+
+        # Group rows by path rank so a section maps to one block of positions
+        row_ranks = store.path_rank[df['page_id'].to_numpy()]
+        self.rows_by_path = np.argsort(row_ranks, kind='stable')
+        self.path_row_offsets = np.searchsorted(row_ranks[self.rows_by_path], np.arange(len(store.pages) + 1))
+
+        self.page_aggregates = df.groupby([df['date'].dt.to_period(AGGREGATE_FREQ).rename('period'), 'page_id']).agg(
+            clicks=('clicks', 'sum'),
+            impressions=('impressions', 'sum'),
+            position_sum=('position', 'sum'),
+            rows=('position', 'count')
+        ).reset_index()
+
+        # Row positions of the dropdown sections, built once so a preloaded
+        # master shares them with every worker; other prefixes are cached lazily
+        self._section_positions = {prefix: self.section_rows(prefix) for prefix in store.sections}
+        self._extra_positions = {}
+
+    def section_rows(self, prefix):
+        """Return the positions (in date order) of all rows under a path prefix"""
+        lo, hi = self.store.section_range(prefix)
+        return np.sort(self.rows_by_path[self.path_row_offsets[lo]:self.path_row_offsets[hi]])
+
+    def section_positions(self, prefix):
+        """Return the cached row positions (in date order) of a path prefix"""
+        positions = self._section_positions.get(prefix)
+        if positions is None:
+            positions = self._extra_positions.get(prefix)
+        if positions is None:
+            if len(self._extra_positions) >= SECTION_CACHE_SIZE:
+                self._extra_positions.clear()
+            positions = self._extra_positions[prefix] = self.section_rows(prefix)
+        return positions
+
+    def date_slice(self, start_date=None, end_date=None, section=None):
+        """Return the rows between two dates (inclusive) without scanning the frame.
+
+        Rows are in date order, so a date bound is one binary search over the
+        full frame; within a section it becomes a second search over the
+        section's sorted positions. Only the requested slice is copied.
+        """
+        lo, hi = self.date_bounds(start_date, end_date)
+        if not section:
+            return self.df.iloc[lo:hi]
+        positions = self.section_positions(section)
+        return self.df.iloc[positions[np.searchsorted(positions, lo):np.searchsorted(positions, hi)]]
+
+    def date_bounds(self, start_date=None, end_date=None):
+        """Return the [lo, hi) row positions of a date range over the full frame"""
+        dates = self.df['date']
+        lo = 0 if start_date is None else dates.searchsorted(pd.Timestamp(start_date), side='left')
+        hi = len(dates) if end_date is None else dates.searchsorted(pd.Timestamp(end_date), side='right')
+        return lo, hi
+
+    def group_key(self, df, key):
+        if key in ('type', 'page_id', 'date'):
+            return df[key]
+        if key == 'week':
+            values = df['date'].dt.to_period('W').dt.end_time.dt.normalize()
+        elif key == 'month':
+            values = df['date'].dt.to_period('M').dt.end_time.dt.normalize()
+        elif key == 'weekday':
+            values = df['date'].dt.day_name()
+        elif key == 'year_month':
+            values = df['date'].dt.to_period('M').astype(str)
+        else:
+            raise ValueError(f"Unknown group key: {key}")
+        return values.rename(key)
+
+    def aggregate(self, start_date=None, end_date=None, by=(), section=None, **aggs):
+        df = self.date_slice(start_date, end_date, section)
+        if not by:
+            return pd.DataFrame({name: [df[column].agg(func)] for name, (column, func) in aggs.items()})
+        keys = [self.group_key(df, key) for key in by]
+        return df.groupby(keys).agg(**aggs).reset_index()
+
+    def rows(self, start_date=None, end_date=None, columns=ROW_COLUMNS, section=None):
+        return self.date_slice(start_date, end_date, section)[list(columns)]
+
+    def count_rows(self, start_date=None, end_date=None, section=None):
+        lo, hi = self.date_bounds(start_date, end_date)
+        if not section:
+            return int(hi - lo)
+        positions = self.section_positions(section)
+        return int(np.searchsorted(positions, hi) - np.searchsorted(positions, lo))
+
+    def period_page_totals(self, first_period, last_period, section=None):
+        periods = self.page_aggregates['period']
+        full = self.page_aggregates[(periods >= first_period) & (periods <= last_period)]
+        if section:
+            lo, hi = self.store.section_range(section)
+            ranks = self.store.path_rank[full['page_id'].to_numpy()]
+            full = full[(ranks >= lo) & (ranks < hi)]
+        return full.drop(columns='period')
+
+class SQLiteBackend(QueryBackend):
+    """Serve queries from an indexed on-disk SQLite database.
+
+    Rows are never held in memory; date ranges, types and sections are
+    resolved with index range scans. Each thread opens its own read-only
+    connection.
+    """
+    name = 'sqlite'
+
+    SQL_KEYS = {
+        'date': 'date',
+        'week': "date(date, 'weekday 0')",
+        'month': "date(date, 'start of month', '+1 month', '-1 day')",
+        'weekday': "CAST(strftime('%w', date) AS INTEGER)",
+        'year_month': "strftime('%Y-%m', date)",
+        'type': 'type',
+        'page_id': 'page_id'
+    }
+    SQL_COLUMNS = ('date', 'type', 'page_id', 'clicks', 'impressions', 'ctr', 'position')
+    SQL_AGGS = {
+        'sum': 'COALESCE(SUM({}), 0)',
+        'mean': 'AVG({})',
+        'count': 'COUNT({})',
+        'nunique': 'COUNT(DISTINCT {})',
+        'min': 'MIN({})',
+        'max': 'MAX({})'
+    }
+
+    def __init__(self, store, db_path):
+        super().__init__(store)
+        self.db_path = db_path
+        self._local = threading.local()
+        _sqlite_backends.add(self)
+
+    def reset_connections(self):
+        """Forget connections opened so far; sqlite connections must not cross a fork"""
+        self._local = threading.local()
+
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, check_same_thread=False)
+            self._local.connection = connection
+        return connection
+
+    def query(self, sql, params=()):
+        return pd.read_sql_query(sql, self.connection(), params=params)
+
+    def where(self, start_date=None, end_date=None, section=None, table='rows'):
+        clauses, params = [], []
+        if start_date is not None:
+            clauses.append(f'{table}.date >= ?')
+            params.append(pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+        if end_date is not None:
+            clauses.append(f'{table}.date <= ?')
+            params.append(pd.Timestamp(end_date).strftime('%Y-%m-%d'))
+        if section:
+            lo, hi = self.store.section_range(section)
+            clauses.append(f'{table}.path_rank >= ? AND {table}.path_rank < ?')
+            params.extend([int(lo), int(hi)])
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def aggregate(self, start_date=None, end_date=None, by=(), section=None, **aggs):
+        for key in by:
+            if key not in self.SQL_KEYS:
+                raise ValueError(f"Unknown group key: {key}")
+        for column, func in aggs.values():
+            if column not in self.SQL_COLUMNS or func not in self.SQL_AGGS:
+                raise ValueError(f"Unsupported aggregation: {func} of {column}")
+        select = [f'{self.SQL_KEYS[key]} AS {key}' for key in by]
+        select += [f'{self.SQL_AGGS[func].format(column)} AS {name}' for name, (column, func) in aggs.items()]
+        where, params = self.where(start_date, end_date, section)
+        sql = f"SELECT {', '.join(select)} FROM rows{where}"
+        if by:
+            sql += ' GROUP BY ' + ', '.join(str(i + 1) for i in range(len(by)))
+            sql += ' ORDER BY ' + ', '.join(str(i + 1) for i in range(len(by)))
+
+        result = self.query(sql, params)
+        for name, (column, func) in aggs.items():
+            if func == 'mean':
+                result[name] = result[name].astype(float)
+        for key in by:
+            if key in ('date', 'week', 'month'):
+                result[key] = pd.to_datetime(result[key])
+            elif key == 'weekday':
+                # SQLite numbers weekdays from Sunday
+                result[key] = [WEEKDAYS[(day - 1) % 7] for day in result[key]]
+        return result
+
+    def rows(self, start_date=None, end_date=None, columns=ROW_COLUMNS, section=None):
+        for column in columns:
+            if column != 'page' and column not in self.SQL_COLUMNS:
+                raise ValueError(f"Unknown column: {column}")
+        where, params = self.where(start_date, end_date, section)
+        select = ', '.join('pages.page AS page' if c == 'page' else f'rows.{c} AS {c}' for c in columns)
+        join = ' JOIN pages ON pages.page_id = rows.page_id' if 'page' in columns else ''
+        result = self.query(f'SELECT {select} FROM rows{join}{where} ORDER BY rows.date', params)
+        if 'date' in result:
+            result['date'] = pd.to_datetime(result['date'])
+        return result
+
+    def period_page_totals(self, first_period, last_period, section=None):
+        sql = ('SELECT page_id, clicks, impressions, position_sum, rows FROM page_periods'
+               ' WHERE period >= ? AND period <= ?')
+        params = [str(first_period), str(last_period)]
+        if section:
+            lo, hi = self.store.section_range(section)
+            sql += ' AND path_rank >= ? AND path_rank < ?'
+            params.extend([int(lo), int(hi)])
+        return self.query(sql, params)
+
+    @staticmethod
+    def build(csv_path, db_path, pages, page_types, path_rank):
+        """Stream a CSV export into a new SQLite database with its indexes"""
+        tmp_path = f'{db_path}.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        connection = sqlite3.connect(tmp_path)
+        connection.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE rows (
+                date TEXT NOT NULL,
+                type TEXT,
+                page_id INTEGER NOT NULL,
+                path_rank INTEGER NOT NULL,
+                clicks INTEGER,
+                impressions INTEGER,
+                ctr REAL,
+                position REAL
+            );
+            CREATE TABLE pages (
+                page_id INTEGER PRIMARY KEY,
+                page TEXT NOT NULL,
+                type TEXT
+            );
+        """)
+
+        connection.executemany(
+            'INSERT INTO pages VALUES (?, ?, ?)',
+            zip(range(len(pages)), pages, page_types.reindex(range(len(pages))).tolist())
+        )
+
+        for chunk in pd.read_csv(csv_path, chunksize=CSV_CHUNK_SIZE):
+            chunk['date'] = pd.to_datetime(chunk['date']).dt.strftime('%Y-%m-%d')
+            page_ids = pages.get_indexer(chunk['page'])
+            chunk = chunk.assign(page_id=page_ids, path_rank=path_rank[page_ids])
+            chunk[['date', 'type', 'page_id', 'path_rank', 'clicks', 'impressions', 'ctr', 'position']].to_sql(
+                'rows', connection, if_exists='append', index=False)
+
+        connection.executescript("""
+            CREATE INDEX idx_rows_date ON rows (date);
+            CREATE INDEX idx_rows_type_date ON rows (type, date);
+            CREATE INDEX idx_rows_page ON rows (page_id);
+            CREATE INDEX idx_rows_path_rank ON rows (path_rank, date);
+            CREATE INDEX idx_pages_page ON pages (page);
+
+            CREATE TABLE page_periods AS
+            SELECT strftime('%Y-%m', date) AS period,
+                   page_id,
+                   MIN(path_rank) AS path_rank,
+                   SUM(clicks) AS clicks,
+                   SUM(impressions) AS impressions,
+                   SUM(position) AS position_sum,
+                   COUNT(position) AS rows
+            FROM rows
+            GROUP BY period, page_id;
+            CREATE INDEX idx_page_periods ON page_periods (period, path_rank);
+
+            ANALYZE;
+        """)
+        connection.commit()
+        connection.close()
+        os.replace(tmp_path, db_path)
+
+def _reset_sqlite_connections():
+    for backend in list(_sqlite_backends):
+        backend.reset_connections()
+
+# A preloaded gunicorn master may have queried the database before forking
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_sqlite_connections)
@@ -0,0 +1,144 @@
+# startup_profile.py
+"""Startup profiling, enabled with DASHBOARD_PROFILE_STARTUP=1.
+
+Reports per-module import time (cumulative and self), the time spent in
+named startup phases such as loading data, and the total time from process
+start to the first request served. Under gunicorn it is installed from the
+config file, so gunicorn's own startup is the only part not broken down by
+module. Everything is a no-op when disabled.
+"""
+import contextlib
+import os
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+
+ENABLED = os.environ.get('DASHBOARD_PROFILE_STARTUP') == '1'
+TOP_MODULES = int(os.environ.get('DASHBOARD_PROFILE_TOP', 25))
+
+def process_start():
+    """perf_counter() value at which this process started, read from /proc where available"""
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the parenthesised command name start at field 3; starttime is field 22
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        age = 0.0
+    return time.perf_counter() - max(age, 0.0)
+
+# Forked workers inherit this, so their first request is timed from the master's start
+STARTED = process_start()
+
+import_times = {}
+phase_times = {}
+_local = threading.local()
+
+class _TimedLoader:
+    """Wrap a module loader and record how long executing the module takes"""
+
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = _local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = stack.pop()
+            import_times[self._name] = (elapsed, elapsed - children)
+            if stack:
+                stack[-1] += elapsed
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path hook that resolves specs with the other finders and times their loaders"""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, fullname)
+                return spec
+        return None
+
+_finder = _TimingFinder()
+_deferred = False
+
+def install(defer_report=False):
+    """Start timing imports; call before importing anything else.
+
+    With defer_report the app's report(server) call only hooks the first
+    request, and the profile is printed by a later report() call, e.g. from
+    gunicorn's when_ready once the master has finished starting up.
+    """
+    global _deferred
+    if ENABLED and _finder not in sys.meta_path:
+        phase_times.setdefault('before profiling', time.perf_counter() - STARTED)
+        sys.meta_path.insert(0, _finder)
+    _deferred = _deferred or defer_report
+
+@contextlib.contextmanager
+def phase(name):
+    """Time a named startup phase"""
+    stack = getattr(_local, 'stack', None)
+    children = stack[-1] if stack else 0.0
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = phase_times[name] = time.perf_counter() - started
+        # Count the phase like a child import so it stays out of the enclosing
+        # module's self time, and so out of the import total; imports made
+        # during the phase are already counted as children
+        if stack:
+            stack[-1] = children + elapsed
+
+def report(server=None):
+    """Print the import report and arrange for time-to-first-request to be printed"""
+    if not ENABLED:
+        return
+    if server is not None:
+        watch_first_request(server)
+        if _deferred:
+            return
+    if _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+
+    total_imports = sum(self_time for _, self_time in import_times.values())
+    lines = [f"Startup profile (pid {os.getpid()}): {time.perf_counter() - STARTED:.3f}s from process start to ready, "
+             f"{total_imports:.3f}s importing {len(import_times)} modules"]
+    for name, elapsed in phase_times.items():
+        lines.append(f"  phase {name:<40}{elapsed * 1000:>10.1f} ms")
+    lines.append(f"  {'module':<46}{'cumulative':>12}{'self':>10}")
+    ranked = sorted(import_times.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (cumulative, self_time) in ranked[:TOP_MODULES]:
+        lines.append(f"  {name:<46}{cumulative * 1000:>9.1f} ms{self_time * 1000:>7.1f} ms")
+    print('\n'.join(lines), file=sys.stderr)
+
+def watch_first_request(server):
+    """Print the time from process start to the first request each process serves"""
+    first_request = threading.Lock()
+
+    @server.before_request
+    def report_first_request():
+        # Each worker reports its own first request
+        pid = os.getpid()
+        if first_request.acquire(blocking=False):
+            print(f"Startup profile (pid {pid}): first request after "
+                  f"{time.perf_counter() - STARTED:.3f}s", file=sys.stderr)
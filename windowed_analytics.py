@@ -0,0 +1,80 @@
+# windowed_analytics.py
+from functools import lru_cache
+import pandas as pd
+from data_store import data_store
+
+WINDOW_METRICS = ['clicks', 'impressions', 'ctr']
+CACHE_SIZE = 64
+
+# Results are cached per dataset version and shared by every page, so callers
+# must treat the returned frames as read-only.
+
+def daily_series(section=None):
+    """Daily per-type totals with one column per (metric, type).
+
+    Every calendar day between the first and last date is present (missing
+    days are 0), so time-based windows line up with the calendar. Metrics are
+    daily sums, matching get_time_series_data.
+    """
+    return _daily_series(data_store.version, section)
+
+def rolling(window_days, how='mean', section=None):
+    """Trailing calendar-window mean or sum of every daily series.
+
+    Days before a full window is available are NaN.
+    """
+    return _rolling(data_store.version, section, window_days, how)
+
+def period_over_period(lag_days, window_days=7, section=None):
+    """Compare trailing window sums with the same window lag_days earlier.
+
+    Returns a frame with 'current', 'previous', 'change' and 'change_pct'
+    blocks over the (metric, type) columns. Use lag_days=7 for week-over-week
+    and lag_days=364 for year-over-year (52 weeks, so weekdays line up).
+    """
+    return _period_over_period(data_store.version, section, lag_days, window_days)
+
+def cumulative(section=None):
+    """Running totals of every daily series"""
+    return _cumulative(data_store.version, section)
+
+def per_period(daily, freq):
+    """Express a daily-rate frame per aggregation period ('D', 'W' or 'M').
+
+    Each period takes the value on its last day scaled by the number of days
+    it covers, so it is comparable with the period sums being plotted.
+    """
+    if freq == 'D':
+        return daily
+    days = pd.Series(1, index=daily.index).resample(freq).sum()
+    return daily.resample(freq).last().mul(days, axis=0)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _daily_series(version, section):
+    daily = data_store.backend.aggregate(
+        by=['date', 'type'], section=section,
+        **{metric: (metric, 'sum') for metric in WINDOW_METRICS}
+    )
+    wide = daily.pivot(index='date', columns='type', values=WINDOW_METRICS)
+    calendar = pd.date_range(data_store.min_date, data_store.max_date, freq='D', name='date')
+    return wide.reindex(calendar).fillna(0)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _rolling(version, section, window_days, how):
+    return _daily_series(version, section).rolling(f'{window_days}D', min_periods=window_days).agg(how)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _period_over_period(version, section, lag_days, window_days):
+    current = _rolling(version, section, window_days, 'sum')
+    previous = current.shift(lag_days, freq='D').reindex(current.index)
+    change = current - previous
+    return pd.concat({
+        'current': current,
+        'previous': previous,
+        'change': change,
+        'change_pct': change / previous.where(previous != 0) * 100
+    }, axis=1)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cumulative(version, section):
+    return _daily_series(version, section).cumsum()